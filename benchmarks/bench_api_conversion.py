@@ -0,0 +1,132 @@
+"""Benchmark converting and encoding Places API responses.
+
+Compares the former path, which copied every message into hand-built dicts
+with hasattr checks, round-tripped each place through ``json.dumps`` and
+``json.loads`` and wrote it with ``indent=4``, against converting the raw
+protobuf messages straight into Place and Review records and encoding each
+one once. CPU time is reported per 10k places.
+
+Usage:
+    python -m benchmarks.bench_api_conversion [--places 10000] [--reviews 5]
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+from places_scraper.scrapers.places_api_convert import (
+    places_from_response,
+    reviews_from_place,
+)
+from places_scraper.utils import sinks
+
+from .fixtures import place_reviews_response, search_text_response
+
+
+def legacy_place(place) -> Dict[str, Any]:
+    """Convert a searchText place the way search_places used to."""
+    return {
+        "id": place.id,
+        "displayName": {
+            "text": str(place.display_name.text),
+            "languageCode": str(place.display_name.language_code),
+        },
+        "formattedAddress": place.formatted_address,
+        "location": {
+            "latitude": place.location.latitude,
+            "longitude": place.location.longitude,
+        },
+        "rating": place.rating if hasattr(place, "rating") else None,
+        "userRatingCount": (
+            place.user_rating_count if hasattr(place, "user_rating_count") else None
+        ),
+        "types": ", ".join(place.types) if hasattr(place, "types") else "",
+        "primaryType": place.primary_type if hasattr(place, "primary_type") else None,
+    }
+
+
+def legacy_reviews(response) -> List[Dict[str, Any]]:
+    """Convert getPlace reviews the way get_reviews used to."""
+    return [
+        {
+            "name": review.name,
+            "relative_publish_time_description": review.relative_publish_time_description,
+            "rating": review.rating,
+            "text": {
+                "text": str(review.text.text),
+                "language_code": str(review.text.language_code),
+            },
+            "original_text": {
+                "text": str(review.original_text.text),
+                "language_code": str(review.original_text.language_code),
+            },
+            "author_attribution": {
+                "display_name": str(review.author_attribution.display_name),
+                "uri": str(review.author_attribution.uri),
+                "photo_uri": str(review.author_attribution.photo_uri),
+            },
+            "publish_time": review.publish_time.isoformat(),
+        }
+        for review in response.reviews
+    ]
+
+
+def bench_legacy(search_response, review_responses) -> float:
+    """Return the CPU seconds of the former conversion and encoding."""
+    start = time.process_time()
+    for place, reviews in zip(search_response.places, review_responses):
+        place_data = legacy_place(place)
+        place_data["category"] = "restaurants"
+        place_data["reviews"] = legacy_reviews(reviews)
+        serializable_data = json.loads(json.dumps(place_data, default=str))
+        json.dumps(serializable_data, ensure_ascii=False, indent=4, default=str)
+    return time.process_time() - start
+
+
+def bench_records(search_response, review_responses, use_orjson: bool) -> float:
+    """Return the CPU seconds of the record conversion and a single encode."""
+    orjson = sinks.orjson
+    sinks.orjson = orjson if use_orjson else None
+    try:
+        start = time.process_time()
+        places = places_from_response(search_response)
+        for place, reviews in zip(places, review_responses):
+            place.category = "restaurants"
+            place.reviews = reviews_from_place(reviews)
+            sinks.encode_json(place.to_dict())
+        return time.process_time() - start
+    finally:
+        sinks.orjson = orjson
+
+
+def main() -> None:
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--places", type=int, default=10_000)
+    parser.add_argument("--reviews", type=int, default=5)
+    args = parser.parse_args()
+
+    search_response = search_text_response(args.places)
+    review_responses = [
+        place_reviews_response(i, args.reviews) for i in range(args.places)
+    ]
+
+    results = {"legacy": bench_legacy(search_response, review_responses)}
+    results["records"] = bench_records(search_response, review_responses, False)
+    if sinks.orjson is not None:
+        results["orjson"] = bench_records(search_response, review_responses, True)
+
+    scale = 10_000 / args.places
+    print(
+        f"Places API conversion ({args.places} places, {args.reviews} reviews each), "
+        "CPU per 10k places"
+    )
+    for path, elapsed in results.items():
+        print(f"  {path:<8} {elapsed * scale * 1000:9.1f} ms")
+    for path in list(results)[1:]:
+        print(f"  {path} speedup {results['legacy'] / results[path]:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
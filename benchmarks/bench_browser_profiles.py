@@ -0,0 +1,77 @@
+"""Benchmark per-place load time and memory of the browser profiles.
+
+Opens the same Google Maps place pages with the "default" and "lean"
+profiles and reports how long each page took to show its reviews button,
+plus the resident memory of the browser processes afterwards. Needs Chrome
+and network access.
+
+Usage:
+    python -m benchmarks.bench_browser_profiles [--url URL ...]
+"""
+
+import argparse
+import statistics
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from places_scraper.scrapers.browser_profiles import (
+    BROWSER_PROFILES,
+    create_driver,
+    driver_rss_bytes,
+)
+
+DEFAULT_URLS = [
+    "https://www.google.com/maps/place/?q=place_id:ChIJN1t_tDeuEmsRUsoyG83frY4",
+    "https://www.google.com/maps/place/?q=place_id:ChIJ3S-JXmauEmsRUcIaWtf4MzE",
+    "https://www.google.com/maps/place/?q=place_id:ChIJP3Sa8ziYEmsRUKgyFmh9AQM",
+]
+
+
+def bench_profile(profile: str, urls: list) -> dict:
+    """Load every URL with a profile and collect timings and memory."""
+    driver = create_driver(profile)
+    wait = WebDriverWait(driver, 30)
+    load_times = []
+    try:
+        for url in urls:
+            start = time.perf_counter()
+            driver.get(url)
+            try:
+                wait.until(
+                    EC.presence_of_element_located(
+                        (By.CSS_SELECTOR, "button[aria-label*='Reviews for']")
+                    )
+                )
+            except TimeoutException:
+                print(f"  {profile}: reviews button not found on {url}")
+            load_times.append(time.perf_counter() - start)
+        rss = driver_rss_bytes(driver)
+    finally:
+        driver.quit()
+    return {"load_times": load_times, "rss": rss}
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--url", action="append", dest="urls")
+    args = parser.parse_args()
+    urls = args.urls or DEFAULT_URLS
+
+    print(f"Browser profiles ({len(urls)} places)")
+    print(f"  {'profile':<8} {'p50 load':>10} {'mean load':>10} {'RSS':>10}")
+    for profile in BROWSER_PROFILES:
+        result = bench_profile(profile, urls)
+        rss = f"{result['rss'] / 2**20:.0f} MiB" if result["rss"] else "n/a"
+        print(
+            f"  {profile:<8} {statistics.median(result['load_times']):9.2f}s "
+            f"{statistics.mean(result['load_times']):9.2f}s {rss:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark search result card extraction in GoogleMapsScraper.
+
+Compares re-parsing the whole page source with BeautifulSoup on every scroll
+("soup") against pulling only unseen cards as JSON from the browser
+("script").
+
+With ``--browser``, both paths run end to end through ``collect_places`` in
+headless Chrome against a local fixture page. This is the comparison to go
+by, as it includes the in-page DOM walk of the script path.
+
+Without a browser, only the Python side of both paths is replayed: the soup
+path parses page_source snapshots that grow by one batch per scroll, the
+script path decodes the JSON each scroll would return. The script figure is
+then the decode cost alone, so no speedup is reported.
+
+Usage:
+    python -m benchmarks.bench_card_extraction [--cards 200] [--browser]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from bs4 import BeautifulSoup
+
+from places_scraper.scrapers.google_maps_scraper import GoogleMapsScraper
+
+from .fixtures import search_card, search_page_html
+
+
+def bench_offline(cards: int, batch_size: int, filler_kb: int) -> dict:
+    """Replay the Python-side work of both paths without a browser.
+
+    The script timing covers decoding the returned JSON only; the DOM walk
+    it replaces runs in the browser and is not measured here.
+    """
+    # extract_* never touch the driver, so skip launching Chrome
+    scraper = GoogleMapsScraper.__new__(GoogleMapsScraper)
+    scrolls = range(batch_size, cards + batch_size, batch_size)
+    snapshots = [
+        search_page_html(cards, batch_size, min(loaded, cards), filler_kb)
+        for loaded in scrolls
+    ]
+    payloads = [
+        json.dumps([search_card(i) for i in range(loaded - batch_size, min(loaded, cards))])
+        for loaded in scrolls
+    ]
+
+    start = time.perf_counter()
+    places = []
+    for page_source in snapshots:
+        soup = BeautifulSoup(page_source, "html.parser")
+        for element in soup.find_all("div", class_="Nv2PK")[len(places) :]:
+            places.append(scraper.extract_place_info(element))
+    soup_time = time.perf_counter() - start
+    assert len(places) == cards
+
+    start = time.perf_counter()
+    places = []
+    for payload in payloads:
+        for card in json.loads(payload):
+            places.append(scraper.extract_place_card(card))
+    script_time = time.perf_counter() - start
+    assert len(places) == cards
+
+    return {"soup": soup_time, "script": script_time}
+
+
+def bench_browser(cards: int, batch_size: int, filler_kb: int) -> dict:
+    """Run collect_places in headless Chrome for both extraction modes."""
+    from selenium import webdriver  # pylint: disable=import-outside-toplevel
+
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        fixture_path = os.path.join(fixture_dir, "search.html")
+        with open(fixture_path, "w", encoding="utf-8") as fixture_file:
+            fixture_file.write(search_page_html(cards, batch_size, filler_kb=filler_kb))
+
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        scraper = GoogleMapsScraper(options=options)
+        results = {}
+        try:
+            for extraction in ("soup", "script"):
+                scraper.driver.get(f"file://{fixture_path}")
+                start = time.perf_counter()
+                places = scraper.collect_places(cards, extraction)
+                elapsed = time.perf_counter() - start
+                assert len(places) == cards, f"{extraction} found {len(places)} places"
+                results[extraction] = elapsed
+        finally:
+            scraper.close()
+    return results
+
+
+def main() -> None:
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--cards", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--filler-kb", type=int, default=512)
+    parser.add_argument("--browser", action="store_true")
+    args = parser.parse_args()
+
+    bench = bench_browser if args.browser else bench_offline
+    # collect_places scrolls at most 10 times
+    cards = min(args.cards, args.batch_size * 10) if args.browser else args.cards
+    results = bench(cards, args.batch_size, args.filler_kb)
+
+    if args.browser:
+        print(f"Card extraction (browser, {cards} cards, {args.batch_size} per scroll)")
+        for extraction, elapsed in results.items():
+            print(f"  {extraction:<7} {elapsed * 1000:9.1f} ms")
+        print(f"  speedup {results['soup'] / results['script']:9.1f}x")
+    else:
+        print(
+            f"Card extraction, Python side only ({cards} cards, "
+            f"{args.batch_size} per scroll; use --browser to compare end to end)"
+        )
+        print(f"  soup parse     {results['soup'] * 1000:9.1f} ms")
+        print(
+            f"  script decode  {results['script'] * 1000:9.1f} ms"
+            " (excludes the in-page DOM walk)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Benchmark the scrapers end to end without network access.
+
+Runs ``run_places_api_scraper``, ``run_selenium_scraper`` and
+``run_hybrid_scraper`` against a FakePlacesAsyncClient and a local
+MapsFixtureServer, writing to a temporary NDJSON file, and reports
+throughput, per-place latency and the peak resident memory of the process
+and its browsers. The browser scrapers need Chrome and use the lean profile.
+
+Usage:
+    python -m benchmarks.bench_end_to_end [--scrapers api,selenium,hybrid]
+        [--categories 3] [--places 20] [--reviews 20] [--latency-ms 100]
+        [--error-rate 0.0] [--concurrency 5] [--pool-size 2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict
+
+from places_scraper.scrapers.browser_profiles import process_tree_rss_bytes
+from places_scraper.scrapers.google_places_api import GooglePlacesAPI
+from places_scraper.scrapers.hybrid_scraper import run_hybrid_scraper
+from places_scraper.scrapers.places_api_scraper import run_places_api_scraper
+from places_scraper.scrapers.selenium_scraper import run_selenium_scraper
+from places_scraper.utils.checkpoint import RunManifest
+from places_scraper.utils.metrics import metrics
+from places_scraper.utils.sinks import open_sink
+
+from .fake_places import FakePlacesAsyncClient
+from .maps_server import MapsFixtureServer
+
+CATEGORIES = ["restaurants", "cafes", "hotels", "bars", "bakeries", "spas"]
+
+
+class PeakRssSampler:
+    """Samples the RSS of this process and its children on a thread."""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, process_tree_rss_bytes(os.getpid()) or 0)
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "PeakRssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_scraper(scraper: str, config: Dict[str, Any], args) -> Dict[str, Any]:
+    """Run one scraper into a temporary file and measure it."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        output_path = os.path.join(output_dir, "places_bench.ndjson")
+        manifest = RunManifest.create(output_path, scraper, "ndjson")
+        sink = open_sink(output_path, "ndjson", manifest)
+        client = FakePlacesAsyncClient(
+            latency_ms=args.latency_ms,
+            error_rate=args.error_rate,
+            places_per_search=args.places,
+            reviews_per_place=args.reviews,
+        )
+        api = GooglePlacesAPI(config, client=client, cache=None)
+
+        metrics.reset(scraper=scraper)
+        with PeakRssSampler() as sampler:
+            start = time.perf_counter()
+            if scraper == "api":
+                runner = run_places_api_scraper(config, sink, manifest, api=api)
+            elif scraper == "hybrid":
+                runner = run_hybrid_scraper(config, sink, manifest, api=api)
+            else:
+                runner = run_selenium_scraper(config, sink, manifest)
+            asyncio.run(runner)
+            sink.close()
+            elapsed = time.perf_counter() - start
+
+        places = reviews = 0
+        with open(output_path, encoding="utf-8") as output_file:
+            for line in output_file:
+                places += 1
+                reviews += len(json.loads(line)["reviews"])
+
+    place_seconds = metrics.histogram("place_seconds")
+    return {
+        "places": places,
+        "reviews": reviews,
+        "elapsed": elapsed,
+        "p50": place_seconds.quantile(0.5),
+        "p95": place_seconds.quantile(0.95),
+        "peak_rss": sampler.peak,
+        "api_errors": client.errors,
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--scrapers", default="api,selenium,hybrid")
+    parser.add_argument("--categories", type=int, default=3)
+    parser.add_argument("--places", type=int, default=20)
+    parser.add_argument("--reviews", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--pool-size", type=int, default=2)
+    args = parser.parse_args()
+
+    with MapsFixtureServer(
+        places_per_search=args.places, reviews_per_place=args.reviews
+    ) as server:
+        config = {
+            "categories": CATEGORIES[: args.categories],
+            "textQuery": "in District 7, Ho Chi Minh City",
+            "maxPlaces": args.places,
+            "radiusKm": 2,
+            "location": "10.738727, 106.711703",
+            "maxReviews": args.reviews,
+            "maxConcurrency": args.concurrency,
+            "driverPoolSize": args.pool_size,
+            "browserProfile": "lean",
+            "mapsUrl": server.url,
+            # Unlimited quota, the fake client's latency is the bottleneck
+            "rateLimits": {
+                "searchText": {"qps": 1e6, "burst": 1e6},
+                "getPlace": {"qps": 1e6, "burst": 1e6},
+            },
+        }
+
+        results = {
+            scraper: run_scraper(scraper, config, args)
+            for scraper in args.scrapers.split(",")
+        }
+
+    print(
+        f"\nEnd to end ({args.categories} categories x {args.places} places x "
+        f"{args.reviews} reviews, {args.latency_ms:.0f} ms API latency, "
+        f"{args.error_rate:.0%} API errors)"
+    )
+    print(
+        f"  {'scraper':<8} {'places/s':>9} {'reviews/s':>10} {'p50 s':>7} "
+        f"{'p95 s':>7} {'peak RSS':>10} {'errors':>7}"
+    )
+    for scraper, result in results.items():
+        print(
+            f"  {scraper:<8} {result['places'] / result['elapsed']:9.1f} "
+            f"{result['reviews'] / result['elapsed']:10.1f} {result['p50']:7.2f} "
+            f"{result['p95']:7.2f} {result['peak_rss'] / 2**20:7.0f} MiB "
+            f"{result['api_errors']:7d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
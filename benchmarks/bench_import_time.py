@@ -0,0 +1,75 @@
+"""Benchmark the import time of the CLI and of each scraper backend.
+
+Each measurement runs in a fresh interpreter, so nothing is cached in
+``sys.modules``. It times importing the package and the CLI, and loading
+the scraper function of each mode the way a run does. It also lists which
+heavy third-party packages got imported. The median over the runs is
+reported.
+
+Usage:
+    python -m benchmarks.bench_import_time [--runs 10]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Slow third-party packages, by the backend that needs them
+HEAVY_PACKAGES = ("selenium", "bs4", "grpc", "google.maps.places_v1")
+
+CASES = {
+    "package": "import places_scraper",
+    "cli": "import places_scraper.__main__",
+    "api": "from places_scraper.runner import load_scraper; load_scraper('api')",
+    "selenium": "from places_scraper.runner import load_scraper; load_scraper('selenium')",
+    "hybrid": "from places_scraper.runner import load_scraper; load_scraper('hybrid')",
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+print(json.dumps([seconds, [p for p in {heavy!r} if p in sys.modules]]))
+"""
+
+
+def measure(statement: str) -> Tuple[float, List[str]]:
+    """Time a statement in a fresh interpreter.
+
+    Returns:
+        Seconds taken and the heavy packages it imported
+    """
+    code = PROBE.format(statement=statement, heavy=HEAVY_PACKAGES)
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    seconds, imported = json.loads(output.splitlines()[-1])
+    return seconds, imported
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"Import time, median of {args.runs} fresh interpreters")
+    for name, statement in CASES.items():
+        timings = []
+        imported: Dict[str, None] = {}
+        for _ in range(args.runs):
+            seconds, packages = measure(statement)
+            timings.append(seconds)
+            imported.update(dict.fromkeys(packages))
+        print(
+            f"  {name:<9} {statistics.median(timings) * 1000:8.1f} ms"
+            f"  heavy imports: {', '.join(imported) or 'none'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark the memory held by Place and Review records.
+
+Builds reviews the way the scrapers do, with every string freshly allocated
+per review, and reports the bytes each one retains with plain dataclasses
+(the former models) and with the slotted, interning models. It also reports
+the peak memory of encoding one place with all of its reviews in a single
+document against streaming it a review at a time.
+
+Usage:
+    python -m benchmarks.bench_model_memory [--reviews 100000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+from places_scraper.models.place import Place, Review
+from places_scraper.utils.sinks import encode_json, iter_json
+
+
+@dataclass
+class LegacyReview:
+    """Review model as it was before slots and interning."""
+
+    author: str
+    text: str
+    rating: int
+    time: str
+    review_id: str = ""
+    language_code: str = ""
+    publish_time: str = ""
+
+
+def review_fields(index: int) -> Dict[str, Any]:
+    """Return the fields of a review as newly decoded strings."""
+    return {
+        "author": f"Reviewer {index}",
+        "text": f"Review {index}: friendly staff, good food, would come back.",
+        "rating": 1 + index % 5,
+        "time": f"{index % 52 + 1} weeks ago",
+        "review_id": f"places/ChIJ{index // 50:023d}/reviews/{index}",
+        "language_code": "".join(("e", "n")),
+        "publish_time": f"2024-{index % 12 + 1:02d}-01T00:00:00Z",
+    }
+
+
+def retained_bytes(factory: Callable[..., Any], count: int) -> float:
+    """Return the bytes retained per record built by ``factory``."""
+    gc.collect()
+    tracemalloc.start()
+    records = [factory(**review_fields(i)) for i in range(count)]
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return retained / count
+
+
+def encoding_peak(place: Place, encode: Callable[[Place], None]) -> int:
+    """Return the peak bytes allocated while encoding a place."""
+    gc.collect()
+    tracemalloc.start()
+    encode(place)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--reviews", type=int, default=100_000)
+    parser.add_argument("--place-reviews", type=int, default=5_000)
+    args = parser.parse_args()
+
+    legacy = retained_bytes(LegacyReview, args.reviews)
+    slotted = retained_bytes(Review, args.reviews)
+    print(f"Memory per review ({args.reviews} reviews)")
+    print(f"  dataclass {legacy:9.1f} bytes")
+    print(f"  slotted   {slotted:9.1f} bytes")
+    print(f"  saved     {1 - slotted / legacy:9.1%}")
+
+    reviews: List[Review] = [
+        Review(**review_fields(i)) for i in range(args.place_reviews)
+    ]
+    place = Place(
+        name="Place 0",
+        address="District 7, Ho Chi Minh City",
+        phone="",
+        website="",
+        rating=4.5,
+        total_reviews=len(reviews),
+        url="https://www.google.com/maps/place/?q=place_id:ChIJ0",
+        reviews=reviews,
+    )
+
+    def whole(record: Place) -> None:
+        encode_json(record.to_dict())
+
+    def streamed(record: Place) -> None:
+        for _ in iter_json(record):
+            pass
+
+    print(f"Peak memory encoding a place ({args.place_reviews} reviews)")
+    print(f"  to_dict   {encoding_peak(place, whole) / 1024:9.1f} KiB")
+    print(f"  streamed  {encoding_peak(place, streamed) / 1024:9.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark waiting for lazily loaded reviews in headless Chrome.
+
+Loads a local reviews pane that appends a batch of reviews a fixed delay
+after each scroll, then scrolls it to the end twice: once with the fixed
+one second sleeps the scrapers used to rely on, once with PageWaiter's
+MutationObserver-based waits.
+
+Usage:
+    python -m benchmarks.bench_page_waits [--reviews 100] [--delay-ms 300]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from selenium import webdriver
+
+from places_scraper.scrapers.page_waiter import PageWaiter
+
+from .fixtures import reviews_page_html
+
+COUNT_SCRIPT = "return document.querySelectorAll('div.jftiEf').length"
+
+SCROLL_SCRIPT = (
+    "const pane = document.querySelector('div.m6QErb');"
+    "pane.scrollTop = pane.scrollHeight;"
+)
+
+
+def scroll_with_sleeps(driver, total: int) -> int:
+    """Scroll with a fixed one second pause until the count stops growing."""
+    count = driver.execute_script(COUNT_SCRIPT)
+    while count < total:
+        driver.execute_script(SCROLL_SCRIPT)
+        time.sleep(1)
+        new_count = driver.execute_script(COUNT_SCRIPT)
+        if new_count == count:
+            break
+        count = new_count
+    return count
+
+
+def scroll_with_waiter(driver, total: int) -> int:
+    """Scroll with PageWaiter until no new reviews appear."""
+    waiter = PageWaiter(driver)
+    count = driver.execute_script(COUNT_SCRIPT)
+    while count < total:
+        new_count = waiter.wait_for_nodes("div.jftiEf", count, scroll=True)
+        if new_count <= count:
+            break
+        count = new_count
+    return count
+
+
+def main() -> None:
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--reviews", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--delay-ms", type=int, default=300)
+    args = parser.parse_args()
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    try:
+        with tempfile.TemporaryDirectory() as fixture_dir:
+            fixture_path = os.path.join(fixture_dir, "reviews.html")
+            with open(fixture_path, "w", encoding="utf-8") as fixture_file:
+                fixture_file.write(
+                    reviews_page_html(args.reviews, args.batch_size, args.delay_ms)
+                )
+
+            print(
+                f"Review loading ({args.reviews} reviews, {args.batch_size} per load, "
+                f"{args.delay_ms} ms latency)"
+            )
+            for name, strategy in (
+                ("sleep", scroll_with_sleeps),
+                ("observer", scroll_with_waiter),
+            ):
+                driver.get(f"file://{fixture_path}")
+                start = time.perf_counter()
+                count = strategy(driver, args.reviews)
+                elapsed = time.perf_counter() - start
+                print(f"  {name:<9} {elapsed:7.2f} s  {count} reviews")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""In-process stand-in for ``places_v1.PlacesAsyncClient``.
+
+Answers searchText and getPlace requests with synthetic places and reviews
+after a randomized latency, and fails a configurable share of calls with
+the transient error the real API returns under load.
+"""
+
+import asyncio
+import random
+import zlib
+from typing import Optional
+
+from google.api_core import exceptions
+from google.maps import places_v1
+
+from .fixtures import api_place, place_reviews_response
+
+# Places a single search can return, per distinct text query
+PLACES_PER_QUERY = 10_000
+
+# Most reviews the real getPlace returns
+MAX_PLACE_REVIEWS = 5
+
+
+class FakePlacesAsyncClient:
+    """Fake Places client with configurable latency and error rate."""
+
+    def __init__(
+        self,
+        latency_ms: float = 100.0,
+        error_rate: float = 0.0,
+        places_per_search: int = 20,
+        reviews_per_place: int = 5,
+        seed: Optional[int] = 0,
+    ):
+        """Initialize the fake client.
+
+        Args:
+            latency_ms: Mean latency of a call; each call takes between half
+                and one and a half times as long
+            error_rate: Share of calls failing with ServiceUnavailable
+            places_per_search: Places returned by a search, at most one page
+            reviews_per_place: Reviews of each place; getPlace returns at most
+                MAX_PLACE_REVIEWS of them, like the real endpoint
+            seed: Seed of the latency and error draws
+        """
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.places_per_search = places_per_search
+        self.reviews_per_place = reviews_per_place
+        self.random = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+
+    async def _respond(self) -> None:
+        self.calls += 1
+        await asyncio.sleep(self.latency_ms * self.random.uniform(0.5, 1.5) / 1000)
+        if self.random.random() < self.error_rate:
+            self.errors += 1
+            raise exceptions.ServiceUnavailable("Injected fake outage")
+
+    async def search_text(
+        self, request: places_v1.SearchTextRequest, metadata=()
+    ) -> places_v1.SearchTextResponse:
+        """Return the places of a text query, the same ones on every call."""
+        await self._respond()
+        first = zlib.crc32(request.text_query.encode("utf-8")) % 1000 * PLACES_PER_QUERY
+        count = min(request.max_result_count or 20, self.places_per_search)
+        return places_v1.SearchTextResponse(
+            places=[api_place(index) for index in range(first, first + count)]
+        )
+
+    async def get_place(
+        self, request: places_v1.GetPlaceRequest, metadata=()
+    ) -> places_v1.Place:
+        """Return the first reviews of a place, at most MAX_PLACE_REVIEWS."""
+        await self._respond()
+        place_index = int(request.name.rsplit("ChIJ", 1)[-1])
+        return place_reviews_response(
+            place_index, min(self.reviews_per_place, MAX_PLACE_REVIEWS)
+        )
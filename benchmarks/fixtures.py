@@ -0,0 +1,230 @@
+"""Static Google Maps-like fixtures for benchmarks.
+
+The markup mirrors the class names the scrapers select on (``div.Nv2PK``
+result cards inside ``div[role='feed']``) and pads the page with an inline
+payload so page_source is as heavy as a real Maps page. Places API fixtures
+are synthetic ``places_v1`` responses with realistic field sizes.
+"""
+
+import json
+from typing import Dict, List
+
+from google.maps import places_v1
+
+from places_scraper.scrapers.google_maps_scraper import MAPS_URL
+
+# Nesting around each card's fields, similar in weight to the Maps markup
+CARD_PADDING = "".join(
+    f'<div class="lI9IFe{i}" jsaction="mouseover:pane.wfvdle{i}"><span aria-hidden="true">·</span></div>'
+    for i in range(12)
+)
+
+
+def search_card(index: int, maps_url: str = MAPS_URL) -> Dict[str, str]:
+    """Return the fields of the search result card at ``index``."""
+    return {
+        "name": f"Place {index}",
+        "rating": f"{3 + (index % 20) / 10:.1f}",
+        "href": (
+            f"{maps_url}/place/Place+{index}/data=!4m7!3m6"
+            f"!1s0x31752f{index:08x}:0x{index:016x}!8m2!3d10.7!4d106.7?hl=en"
+        ),
+        "reviews": f"({1000 + index * 7:,})",
+    }
+
+
+def search_card_html(index: int, maps_url: str = MAPS_URL) -> str:
+    """Return the markup of the search result card at ``index``."""
+    card = search_card(index, maps_url)
+    return (
+        f'<div class="Nv2PK THOPZb CpccDe" jsaction="mouseover:pane.wfvdle{index}">'
+        f'<a class="hfpxzc" aria-label="{card["name"]}" href="{card["href"]}"></a>'
+        f'<div class="bfdHYd Ppzolf OFBs3e">{CARD_PADDING}'
+        f'<div class="qBF1Pd fontHeadlineSmall">{card["name"]}</div>'
+        f'<span class="ZkP5Je" role="img"><span class="MW4etd">{card["rating"]}</span>'
+        f'<span class="UY7F9">{card["reviews"]}</span></span>'
+        f"</div></div>"
+    )
+
+
+def filler_payload(filler_kb: int) -> str:
+    """Return an inline script payload of roughly ``filler_kb`` kilobytes."""
+    chunk = "AF_initDataCallback({key:'ds:0',data:[null,[[1,2,3]]]});"
+    return chunk * (filler_kb * 1024 // len(chunk) + 1)
+
+
+def search_page_html(
+    total_cards: int,
+    batch_size: int = 20,
+    loaded_cards: int = 0,
+    filler_kb: int = 512,
+    first_card: int = 0,
+    maps_url: str = MAPS_URL,
+) -> str:
+    """Return a search results page that loads more cards as the feed scrolls.
+
+    Args:
+        total_cards: Number of cards available to load
+        batch_size: Cards appended per scroll to the bottom of the feed
+        loaded_cards: Cards already in the feed, e.g. to snapshot page_source
+            after several scrolls; defaults to one batch
+        filler_kb: Size of the inline payload padding the page
+        first_card: Index of the first card, so searches can return
+            different places
+        maps_url: Root URL the cards link their place pages under
+
+    Returns:
+        HTML document
+    """
+    loaded_cards = loaded_cards or min(batch_size, total_cards)
+    cards = [
+        search_card_html(i, maps_url)
+        for i in range(first_card, first_card + total_cards)
+    ]
+    cards_html = "".join(cards[:loaded_cards])
+    remaining: List[str] = cards[loaded_cards:]
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Maps search fixture</title>
+<script>{filler_payload(filler_kb)}</script></head>
+<body>
+<div role="feed" aria-label="Results" style="height:600px;overflow-y:auto">{cards_html}</div>
+<script>
+const remaining = {json.dumps(remaining)};
+const feed = document.querySelector("div[role='feed']");
+feed.addEventListener("scroll", () => {{
+    if (feed.scrollTop + feed.clientHeight < feed.scrollHeight - 1) return;
+    feed.insertAdjacentHTML("beforeend", remaining.splice(0, {batch_size}).join(""));
+}});
+</script>
+</body></html>
+"""
+
+
+def review_html(index: int) -> str:
+    """Return the markup of the review at ``index``."""
+    return (
+        f'<div class="jftiEf fontBodyMedium" data-review-id="review{index}">'
+        f'<div class="d4r55">Reviewer {index}</div>'
+        f'<span class="kvMYJc" role="img" aria-label="{1 + index % 5} stars"></span>'
+        f'<span class="rsqaWe">{1 + index % 11} months ago</span>'
+        f'<span class="wiI7pd">Review text {index} {"lorem ipsum " * (index % 30)}</span>'
+        f"</div>"
+    )
+
+
+def reviews_pane_html(
+    total_reviews: int, batch_size: int = 10, delay_ms: int = 300, display: str = "block"
+) -> str:
+    """Return a reviews pane that appends reviews on a timer after each scroll.
+
+    Reaching the bottom of the pane schedules the next batch ``delay_ms``
+    later, like Maps fetching another page of reviews.
+
+    Args:
+        total_reviews: Number of reviews available to load
+        batch_size: Reviews appended per load
+        delay_ms: Simulated load latency in milliseconds
+        display: Initial CSS display of the pane
+
+    Returns:
+        HTML fragment
+    """
+    first = "".join(review_html(i) for i in range(min(batch_size, total_reviews)))
+    return f"""<div class="m6QErb DxyBCb" style="display:{display};height:600px;overflow-y:auto">{first}</div>
+<script>
+let loaded = {min(batch_size, total_reviews)};
+let loading = false;
+const pane = document.querySelector("div.m6QErb");
+const reviewHtml = {json.dumps([review_html(i) for i in range(total_reviews)])};
+pane.addEventListener("scroll", () => {{
+    if (loading || loaded >= reviewHtml.length) return;
+    if (pane.scrollTop + pane.clientHeight < pane.scrollHeight - 1) return;
+    loading = true;
+    setTimeout(() => {{
+        pane.insertAdjacentHTML("beforeend", reviewHtml.slice(loaded, loaded + {batch_size}).join(""));
+        loaded += {batch_size};
+        loading = false;
+    }}, {delay_ms});
+}});
+</script>"""
+
+
+def reviews_page_html(total_reviews: int, batch_size: int = 10, delay_ms: int = 300) -> str:
+    """Return a page holding only a reviews pane, see reviews_pane_html."""
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Maps reviews fixture</title></head>
+<body>
+{reviews_pane_html(total_reviews, batch_size, delay_ms)}
+</body></html>
+"""
+
+
+def place_page_html(
+    name: str, total_reviews: int, batch_size: int = 10, delay_ms: int = 300
+) -> str:
+    """Return a place page whose reviews tab reveals a reviews pane.
+
+    Args:
+        name: Place name shown on the page
+        total_reviews: Number of reviews available to load
+        batch_size: Reviews appended per load
+        delay_ms: Simulated load latency in milliseconds
+
+    Returns:
+        HTML document
+    """
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{name}</title></head>
+<body>
+<h1 class="DUwDvf">{name}</h1>
+<button data-item-id="address" aria-label="Address: 1 Nguyen Thi Thap, District 7">Address</button>
+<button data-tooltip="Copy phone number" aria-label="Phone: 028 1234 5678">Phone</button>
+<button aria-label="Reviews for {name}"
+    onclick="document.querySelector('div.m6QErb').style.display = 'block'">Reviews</button>
+{reviews_pane_html(total_reviews, batch_size, delay_ms, display="none")}
+</body></html>
+"""
+
+
+def api_place(index: int) -> places_v1.Place:
+    """Return a searchText result as the Places API sends it."""
+    return places_v1.Place(
+        id=f"ChIJ{index:023d}",
+        display_name={"text": f"Place {index}", "language_code": "en"},
+        formatted_address=f"{index} Nguyen Thi Thap, District 7, Ho Chi Minh City, Vietnam",
+        location={
+            "latitude": 10.73 + index % 1000 * 1e-5,
+            "longitude": 106.71 + index % 1000 * 1e-5,
+        },
+        rating=3 + (index % 20) / 10,
+        user_rating_count=1000 + index * 7,
+        types=["restaurant", "food", "point_of_interest", "establishment"],
+    )
+
+
+def search_text_response(count: int) -> places_v1.SearchTextResponse:
+    """Return a searchText response with ``count`` places."""
+    return places_v1.SearchTextResponse(places=[api_place(i) for i in range(count)])
+
+
+def api_review(place_index: int, index: int) -> places_v1.Review:
+    """Return a review as the Places API sends it."""
+    text = {"text": f"Review {index} of place {place_index}. " * 8, "language_code": "en"}
+    return places_v1.Review(
+        name=f"places/ChIJ{place_index:023d}/reviews/{index}",
+        relative_publish_time_description=f"{index + 1} weeks ago",
+        rating=1 + index % 5,
+        text=text,
+        original_text=text,
+        author_attribution={
+            "display_name": f"Reviewer {index}",
+            "uri": f"https://www.google.com/maps/contrib/{index:021d}/reviews",
+            "photo_uri": f"https://lh3.googleusercontent.com/a/{index:021d}=s128",
+        },
+        publish_time={"seconds": 1_700_000_000 - index * 604_800},
+    )
+
+
+def place_reviews_response(place_index: int, count: int = 5) -> places_v1.Place:
+    """Return a getPlace response carrying ``count`` reviews."""
+    return places_v1.Place(reviews=[api_review(place_index, i) for i in range(count)])
@@ -0,0 +1,105 @@
+"""Local HTTP server for Maps-like search and place pages.
+
+Serves the fixtures in ``benchmarks.fixtures`` under the same paths the
+browser scrapers build, so pointing ``mapsUrl`` at ``MapsFixtureServer.url``
+runs them offline:
+
+- ``/maps/search/<query>/...``: search results feed; each query gets its own
+  block of place cards
+- ``/maps/place/...``: place page with address, phone and a reviews tab
+"""
+
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .fixtures import place_page_html, search_page_html
+
+
+class MapsFixtureServer:
+    """Serves Maps fixtures from a background thread."""
+
+    def __init__(
+        self,
+        places_per_search: int = 20,
+        reviews_per_place: int = 20,
+        review_delay_ms: int = 100,
+        filler_kb: int = 512,
+    ):
+        """Configure the served pages.
+
+        Args:
+            places_per_search: Cards a search page can scroll through
+            reviews_per_place: Reviews a place page can scroll through
+            review_delay_ms: Latency of each further batch of reviews
+            filler_kb: Inline payload padding each search page
+        """
+        self.places_per_search = places_per_search
+        self.reviews_per_place = reviews_per_place
+        self.review_delay_ms = review_delay_ms
+        self.filler_kb = filler_kb
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Root URL to use as ``mapsUrl``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/maps"
+
+    def page(self, path: str) -> str:
+        """Return the page served at a path, or an empty string if unknown."""
+        parts = urlsplit(path)
+        if parts.path.startswith("/maps/search/"):
+            query = unquote(parts.path.split("/")[3])
+            first = zlib.crc32(query.encode("utf-8")) % 1000 * 1000
+            return search_page_html(
+                self.places_per_search,
+                filler_kb=self.filler_kb,
+                first_card=first,
+                maps_url=self.url,
+            )
+        if parts.path.startswith("/maps/place/"):
+            name = unquote(parts.path.split("/")[3]).replace("+", " ")
+            name = name or parse_qs(parts.query).get("q", [""])[0]
+            return place_page_html(
+                name or "Place", self.reviews_per_place, delay_ms=self.review_delay_ms
+            )
+        return ""
+
+    def start(self) -> "MapsFixtureServer":
+        """Start serving on a free local port."""
+        fixtures = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                body = fixtures.page(self.path).encode("utf-8")
+                self.send_response(200 if body else 404)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="maps-fixtures", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MapsFixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
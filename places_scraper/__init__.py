@@ -2,11 +2,31 @@
 
 __version__ = "1.0.0"
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .models.place import Place, Review
-from .scrapers.google_places_api import GooglePlacesAPI
-from .scrapers.google_maps_scraper import GoogleMapsScraper
 from .utils.config import load_config, validate_config
 
+if TYPE_CHECKING:
+    from .scrapers.google_maps_scraper import GoogleMapsScraper
+    from .scrapers.google_places_api import GooglePlacesAPI
+
+# Backends imported on first access: Selenium and the Places API client are
+# slow to import, and each scraper mode only needs its own
+_LAZY_EXPORTS = {
+    "GooglePlacesAPI": ".scrapers.google_places_api",
+    "GoogleMapsScraper": ".scrapers.google_maps_scraper",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "Place",
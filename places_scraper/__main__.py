@@ -1,68 +1,146 @@
 """Main entry point for the places scraper."""
 
 import os
-import time
 import asyncio
+import argparse
+import logging
+import multiprocessing
 from datetime import datetime
 
+from .runner import job_queue_path, run_scraper, run_worker, worker_process
 from .utils.config import load_config, validate_config
-from .scrapers.selenium_scraper import run_selenium_scraper
-from .scrapers.places_api_scraper import run_places_api_scraper
-from .scrapers.hybrid_scraper import run_hybrid_scraper
+from .utils.checkpoint import RunManifest
+from .utils.job_queue import DEFAULT_MAX_ATTEMPTS, JobQueue
+from .utils.log import DEFAULT_LOG_LEVEL, LOG_LEVELS, setup_logging, shutdown_logging
+from .utils.sinks import DEFAULT_OUTPUT_FORMAT, SINK_FORMATS
+
+logger = logging.getLogger("places_scraper")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog="places_scraper")
+    parser.add_argument(
+        "--resume",
+        metavar="RUN",
+        help="Resume an interrupted run, given its timestamp or output file path",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the stages of the run, like the profile config option",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=LOG_LEVELS,
+        help="Lowest level logged, overriding the logLevel config option",
+    )
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Add a job per area and category to the job queue, then exit",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Scrape jobs from the job queue until it is drained",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Number of worker processes to start with --worker",
+    )
+    args = parser.parse_args()
+    if args.workers != 1 and not args.worker:
+        parser.error("--workers requires --worker")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return args
 
 
 async def main():
     """Main entry point."""
+    args = parse_args()
+
     # Load and validate config
     config = load_config()
     validate_config(config)
+    log_level = args.log_level or config.get("logLevel", DEFAULT_LOG_LEVEL)
+    setup_logging(log_level, config.get("logFile"))
+    profile = args.profile or config.get("profile", False)
 
     # Create output directory
     output_dir = config.get("output_dir", "output")
     os.makedirs(output_dir, exist_ok=True)
 
-    # Create output file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = open(
-        os.path.join(output_dir, f"places_{timestamp}.json"), "w", encoding="utf-8"
-    )
-    output_file.write("[\n")
-
-    try:
-        # Define scraper functions
-        scraper_functions = {
-            "selenium": run_selenium_scraper,
-            "api": run_places_api_scraper,
-            "hybrid": run_hybrid_scraper,
-        }
-
-        # Get scraper type from config
-        scraper_type = config.get("scraper", "")
-        if scraper_type not in scraper_functions:
-            raise ValueError(
-                f"Invalid scraper type. Must be {', '.join(scraper_functions.keys())}"
-            )
-
-        # Run the selected scraper
-        start_time, place_times = await scraper_functions[scraper_type](
-            config, output_file
+    if args.enqueue:
+        jobs = JobQueue(
+            job_queue_path(config), config.get("jobMaxAttempts", DEFAULT_MAX_ATTEMPTS)
         )
+        added = jobs.add(config.get("areas", [{}]), config["categories"])
+        logger.info("Added %d jobs to %s: %s", added, jobs.path, jobs.counts())
+        jobs.close()
+        return
 
-        # Write closing bracket
-        output_file.write("\n]")
+    if args.worker:
+        if args.workers > 1:
+            processes = [
+                multiprocessing.Process(
+                    target=worker_process, args=(config, log_level, profile)
+                )
+                for _ in range(args.workers)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+        else:
+            await run_worker(config, profile=profile)
+        return
 
-        # Print summary
-        total_time = time.time() - start_time
-        print(f"\nScraping completed in {total_time:.2f} seconds")
-        print(
-            f"Average time per category: {sum(place_times) / len(place_times):.2f} seconds"
+    if args.resume:
+        # Reopen the interrupted run's output after its last complete place
+        manifest = RunManifest.find(args.resume, output_dir)
+        if manifest is None:
+            logger.error("No checkpoint manifest found for run %s", args.resume)
+            return
+        if manifest.is_complete:
+            logger.info("Run %s already completed", args.resume)
+            return
+        config["scraper"] = manifest.data["scraper"]
+        output_format = manifest.data.get("output_format", DEFAULT_OUTPUT_FORMAT)
+        output_path = manifest.output_path
+        logger.info("Resuming %s after %d places", output_path, manifest.place_count)
+    else:
+        # Create output file
+        output_format = config.get("outputFormat", DEFAULT_OUTPUT_FORMAT)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = os.path.join(
+            output_dir, f"places_{timestamp}{SINK_FORMATS[output_format].extension}"
+        )
+        manifest = RunManifest.create(
+            output_path, config.get("scraper", ""), output_format
         )
 
+    try:
+        await run_scraper(
+            config,
+            output_path,
+            output_format,
+            manifest,
+            resume=bool(args.resume),
+            profile=profile,
+        )
     except Exception as e:
-        print(f"Error in main: {str(e)}")
-    finally:
-        output_file.close()
+        logger.error(
+            "Error in main: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG)
+        )
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    finally:
+        shutdown_logging()
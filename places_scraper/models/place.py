@@ -1,10 +1,16 @@
-"""Models for place and review data."""
+"""Models for place and review data.
 
+Both models are slotted, and their low-cardinality strings (relative review
+times, language codes, categories and place types) are interned, so a crawl
+holding hundreds of thousands of reviews keeps one copy of each value.
+"""
+
+import sys
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Review:
     """Review data model."""
 
@@ -12,6 +18,13 @@ class Review:
     text: str
     rating: int
     time: str
+    review_id: str = ""
+    language_code: str = ""
+    publish_time: str = ""
+
+    def __post_init__(self) -> None:
+        self.time = sys.intern(self.time)
+        self.language_code = sys.intern(self.language_code)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert review to dictionary."""
@@ -20,10 +33,18 @@ class Review:
             "text": self.text,
             "rating": self.rating,
             "time": self.time,
+            "review_id": self.review_id,
+            "language_code": self.language_code,
+            "publish_time": self.publish_time,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Review":
+        """Create a review from the output of to_dict."""
+        return cls(**data)
 
-@dataclass
+
+@dataclass(slots=True)
 class Place:
     """Place data model."""
 
@@ -34,12 +55,29 @@ class Place:
     rating: float
     total_reviews: int
     url: str
+    place_id: str = ""
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    types: List[str] = field(default_factory=list)
+    primary_type: str = ""
     category: str = ""
+    categories: List[str] = field(default_factory=list)
     reviews: List[Review] = field(default_factory=list)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert place to dictionary."""
-        return {
+    def __post_init__(self) -> None:
+        self.types = [sys.intern(place_type) for place_type in self.types]
+        self.primary_type = sys.intern(self.primary_type)
+        self.category = sys.intern(self.category)
+        self.categories = [sys.intern(category) for category in self.categories]
+
+    def to_dict(self, include_reviews: bool = True) -> Dict[str, Any]:
+        """Convert place to dictionary.
+
+        Args:
+            include_reviews: Whether to convert the reviews too; encoders that
+                stream reviews one by one leave them out
+        """
+        data = {
             "name": self.name,
             "address": self.address,
             "phone": self.phone,
@@ -47,6 +85,20 @@ class Place:
             "rating": self.rating,
             "total_reviews": self.total_reviews,
             "url": self.url,
+            "place_id": self.place_id,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "types": self.types,
+            "primary_type": self.primary_type,
             "category": self.category,
-            "reviews": [review.to_dict() for review in self.reviews],
+            "categories": self.categories,
         }
+        if include_reviews:
+            data["reviews"] = [review.to_dict() for review in self.reviews]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Place":
+        """Create a place from the output of to_dict."""
+        reviews = [Review.from_dict(review) for review in data.get("reviews", [])]
+        return cls(**{**data, "reviews": reviews})
@@ -1,13 +1,23 @@
 """Query models for API requests."""
 
-from typing import TypedDict
+from typing import Any, Dict, Optional, TypedDict
 
 
-class PlaceSearchQuery(TypedDict):
-    """Query parameters for place search."""
-
+class _PlaceSearchQueryBase(TypedDict):
     textQuery: str
     radius: int
     maxPlaces: int
     location: str
     languageCode: str
+
+
+class PlaceSearchQuery(_PlaceSearchQueryBase, total=False):
+    """Query parameters for place search.
+
+    ``radius`` is in meters around the "lat, lng" ``location``. A GeoJSON
+    ``polygon`` replaces the circle as the search area of a tiled search, and
+    a ``rectangle`` viewport restricts results to a single tile.
+    """
+
+    polygon: Optional[Dict[str, Any]]
+    rectangle: Dict[str, Dict[str, float]]
@@ -0,0 +1,325 @@
+"""Running the scrapers, once or as workers of a job queue."""
+
+import asyncio
+import importlib
+import logging
+import os
+import re
+import socket
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .utils.checkpoint import RunManifest, manifest_path_for
+from .utils.job_queue import DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS, Job, JobQueue
+from .utils.log import setup_logging, shutdown_logging
+from .utils.metrics import metrics, report_path_for
+from .utils.profiling import DEFAULT_TOP_N, profile_dir_for, profiler
+from .utils.sinks import (
+    DEFAULT_OUTPUT_BUFFER,
+    DEFAULT_OUTPUT_FORMAT,
+    SINK_FORMATS,
+    open_sink,
+)
+
+logger = logging.getLogger(__name__)
+
+# Scraper functions by scraper type, as "module:function". Selenium and the
+# Places API client take most of the startup time to import, so only the
+# backend of the selected scraper is imported, on first use.
+SCRAPERS = {
+    "selenium": ".scrapers.selenium_scraper:run_selenium_scraper",
+    "api": ".scrapers.places_api_scraper:run_places_api_scraper",
+    "hybrid": ".scrapers.hybrid_scraper:run_hybrid_scraper",
+}
+
+# Seconds an idle worker waits before looking for jobs again
+WORKER_POLL_SECONDS = 10
+
+
+def load_scraper(scraper_type: str) -> Callable[..., Awaitable[Dict[str, int]]]:
+    """Import the scraper function of a scraper type.
+
+    Args:
+        scraper_type: Key of SCRAPERS
+
+    Returns:
+        Scraper function, called with the config, sink and manifest
+
+    Raises:
+        ValueError: If the scraper type is invalid
+    """
+    if scraper_type not in SCRAPERS:
+        raise ValueError(f"Invalid scraper type. Must be {', '.join(SCRAPERS.keys())}")
+    module_name, function_name = SCRAPERS[scraper_type].split(":")
+    return getattr(importlib.import_module(module_name, __package__), function_name)
+
+
+async def run_scraper(
+    config: Dict[str, Any],
+    output_path: str,
+    output_format: str,
+    manifest: RunManifest,
+    resume: bool = False,
+    profile: bool = False,
+    cancel: Optional[threading.Event] = None,
+) -> Dict[str, int]:
+    """Run the configured scraper into an output file.
+
+    The run report, and the stage profiles if profiling, are written next to
+    the output file even when the run fails.
+
+    Args:
+        config: Configuration dictionary
+        output_path: Path of the output file
+        output_format: Output sink format
+        manifest: Checkpoint manifest of the run
+        resume: Append to the output file of an interrupted run
+        profile: Profile the stages of the run
+        cancel: Optional event that stops all writes to the output file once
+            set, failing the run with SinkCancelled
+
+    Returns:
+        Run counters for the summary
+
+    Raises:
+        ValueError: If the scraper type is invalid
+    """
+    scraper_type = config.get("scraper", "")
+    scraper = load_scraper(scraper_type)
+
+    sink = open_sink(
+        output_path,
+        output_format,
+        manifest,
+        resume=resume,
+        max_pending=config.get("outputBufferSize", DEFAULT_OUTPUT_BUFFER),
+        indent=config.get("outputIndent"),
+        cancel=cancel,
+    )
+
+    start_time = time.time()
+    stats = {}
+    completed = False
+    try:
+        # Run the selected scraper
+        metrics.reset(scraper=scraper_type)
+        if profile:
+            profiler.start()
+        stats = await scraper(config, sink, manifest)
+
+        # Terminate the output file
+        sink.close()
+        manifest.mark_complete()
+        completed = True
+
+        # Log summary
+        total_time = time.time() - start_time
+        logger.info("Scraping completed in %.2f seconds", total_time)
+        logger.info("Places written: %d", metrics.total("places_total"))
+        logger.info("Reviews written: %d", metrics.total("reviews_total"))
+        place_seconds = metrics.histogram("place_seconds")
+        if place_seconds.count:
+            logger.info(
+                "Time per place: %.2f seconds on average, %.2f seconds p95",
+                place_seconds.sum / place_seconds.count,
+                place_seconds.quantile(0.95),
+            )
+        for name, value in stats.items():
+            logger.info("%s: %s", name.replace("_", " ").capitalize(), value)
+        return stats
+
+    finally:
+        try:
+            sink.close()
+        except Exception as error:  # pylint: disable=broad-except
+            # Only reached when the run is already failing with its own error
+            logger.debug("Could not terminate the output file: %s", error)
+
+        # Export the run metrics, also for failed runs
+        report_path = report_path_for(output_path)
+        metrics.write_report(
+            report_path,
+            completed=completed,
+            duration_seconds=time.time() - start_time,
+            stats=stats,
+        )
+        logger.info("Run report written to %s", report_path)
+        if config.get("prometheusFile"):
+            metrics.write_prometheus(config["prometheusFile"])
+        if profiler.enabled:
+            profiler.stop()
+            profile_dir = profile_dir_for(output_path)
+            profiler.write(profile_dir, config.get("profileTopN", DEFAULT_TOP_N))
+            logger.info("Stage profiles written to %s", profile_dir)
+
+
+def job_queue_path(config: Dict[str, Any]) -> str:
+    """Return the path of the job queue database of a config."""
+    return config.get(
+        "jobQueue", os.path.join(config.get("output_dir", "output"), "jobs.sqlite3")
+    )
+
+
+def job_config(config: Dict[str, Any], job: Job) -> Dict[str, Any]:
+    """Return the config of a single job: its area and its category."""
+    return {**config, **job.area, "categories": [job.category]}
+
+
+def shard_path(config: Dict[str, Any], job: Job) -> str:
+    """Return the output shard of a job, named after its id and category."""
+    output_format = config.get("outputFormat", DEFAULT_OUTPUT_FORMAT)
+    slug = re.sub(r"[^a-z0-9]+", "-", job.category.lower()).strip("-")
+    return os.path.join(
+        config.get("output_dir", "output"),
+        "shards",
+        f"places_job{job.id:05d}_{slug}{SINK_FORMATS[output_format].extension}",
+    )
+
+
+async def _run_job(
+    config: Dict[str, Any], job: Job, profile: bool, cancel: threading.Event
+) -> str:
+    """Scrape a job into its shard, resuming the shard of an earlier attempt.
+
+    Writing stops as soon as ``cancel`` is set, leaving the shard to the
+    worker that took the job over.
+
+    Returns:
+        Path of the shard
+    """
+    output_path = shard_path(config, job)
+    output_format = config.get("outputFormat", DEFAULT_OUTPUT_FORMAT)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    manifest_path = manifest_path_for(output_path)
+    resume = False
+    if os.path.isfile(manifest_path):
+        manifest = RunManifest.load(manifest_path)
+        if manifest.is_complete:
+            return output_path
+        resume = True
+        logger.info("Resuming %s after %d places", output_path, manifest.place_count)
+    else:
+        manifest = RunManifest.create(output_path, config["scraper"], output_format)
+
+    await run_scraper(
+        job_config(config, job),
+        output_path,
+        output_format,
+        manifest,
+        resume,
+        profile,
+        cancel,
+    )
+    return output_path
+
+
+async def run_worker(
+    config: Dict[str, Any], worker: Optional[str] = None, profile: bool = False
+) -> int:
+    """Work through the job queue until every job is done or failed.
+
+    The lease of the running job is renewed by a background thread, which
+    keeps running while browser scrapers block the event loop. If a renewal
+    fails, another worker may have taken the job over, so the job stops
+    writing to its shard at once and is abandoned without being completed
+    or failed. When only jobs leased by other workers remain, the worker
+    waits for them, taking over any whose lease expires.
+
+    Args:
+        config: Configuration dictionary; ``jobQueue``, ``jobLeaseSeconds``
+            and ``jobMaxAttempts`` configure the queue
+        worker: Worker identifier, host name and process id by default
+        profile: Profile the stages of each job
+
+    Returns:
+        Number of jobs this worker completed
+    """
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    lease_seconds = config.get("jobLeaseSeconds", DEFAULT_LEASE_SECONDS)
+    jobs = JobQueue(
+        job_queue_path(config), config.get("jobMaxAttempts", DEFAULT_MAX_ATTEMPTS)
+    )
+    completed = 0
+
+    def keep_leased(job: Job, done: threading.Event, lost: threading.Event) -> None:
+        # SQLite connections are not shared between threads
+        heartbeat_jobs = JobQueue(jobs.path, jobs.max_attempts)
+        try:
+            while not done.wait(lease_seconds / 3):
+                if not heartbeat_jobs.renew(job, lease_seconds):
+                    logger.warning("Lost the lease of job %d, abandoning it", job.id)
+                    lost.set()
+                    return
+        finally:
+            heartbeat_jobs.close()
+
+    try:
+        while True:
+            job = jobs.lease(worker, lease_seconds)
+            if job is None:
+                counts = jobs.counts()
+                if not counts["pending"] and not counts["leased"]:
+                    break
+                await asyncio.sleep(WORKER_POLL_SECONDS)
+                continue
+
+            logger.info(
+                "Job %d: %s in %s (attempt %d)",
+                job.id,
+                job.category,
+                job.area,
+                job.attempts,
+            )
+            done = threading.Event()
+            lost = threading.Event()
+            heartbeat = threading.Thread(
+                target=keep_leased,
+                args=(job, done, lost),
+                name="job-lease",
+                daemon=True,
+            )
+            heartbeat.start()
+            try:
+                output_path = await _run_job(config, job, profile, lost)
+            except Exception as error:  # pylint: disable=broad-except
+                if lost.is_set():
+                    logger.info("Job %d abandoned: %s", job.id, error)
+                    continue
+                logger.error(
+                    "Job %d failed: %s",
+                    job.id,
+                    error,
+                    exc_info=logger.isEnabledFor(logging.DEBUG),
+                )
+                jobs.fail(job, str(error))
+            else:
+                if lost.is_set():
+                    logger.info("Job %d finished after losing its lease", job.id)
+                    continue
+                jobs.complete(job, output_path)
+                completed += 1
+            finally:
+                done.set()
+                heartbeat.join()
+
+        logger.info("Job queue drained: %s", jobs.counts())
+        return completed
+    finally:
+        jobs.close()
+
+
+def worker_process(config: Dict[str, Any], log_level: str, profile: bool) -> None:
+    """Entry point of a worker process started with ``--workers``.
+
+    Args:
+        config: Configuration dictionary
+        log_level: Lowest level logged
+        profile: Profile the stages of each job
+    """
+    setup_logging(log_level, config.get("logFile"))
+    try:
+        asyncio.run(run_worker(config, profile=profile))
+    finally:
+        shutdown_logging()
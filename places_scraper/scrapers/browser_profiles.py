@@ -0,0 +1,213 @@
+"""Chrome launch profiles for the Selenium-based scrapers."""
+
+import copy
+import os
+import signal
+from typing import List, Optional
+
+from selenium import webdriver
+
+BROWSER_PROFILES = ("default", "lean")
+
+# Requests the scrapers never read: map tiles, imagery, fonts, media and
+# telemetry. Patterns use the wildcard syntax of Network.setBlockedURLs.
+LEAN_BLOCKED_URLS = [
+    # Map tiles and Street View imagery
+    "*/maps/vt*",
+    "*/maps/vt/*",
+    "*khms*.google.com/kh*",
+    "*streetviewpixels-pa.googleapis.com*",
+    "*/maps/sv/*",
+    # Images
+    "*.png*",
+    "*.jpg*",
+    "*.jpeg*",
+    "*.gif*",
+    "*.webp*",
+    "*.svg*",
+    "*.ico*",
+    "*googleusercontent.com*",
+    "*ggpht.com*",
+    # Fonts
+    "*fonts.gstatic.com*",
+    "*fonts.googleapis.com*",
+    "*.woff*",
+    "*.ttf*",
+    # Media
+    "*.mp4*",
+    "*.webm*",
+    "*.m3u8*",
+    # Telemetry
+    "*/gen_204*",
+    "*/log?*",
+    "*/csi?*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+]
+
+LEAN_ARGUMENTS = [
+    "--headless=new",
+    "--window-size=1280,900",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-notifications",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+    "--blink-settings=imagesEnabled=false",
+]
+
+
+def chrome_options(profile: str = "default") -> Optional[webdriver.ChromeOptions]:
+    """Build Chrome options for a profile.
+
+    Args:
+        profile: "default" for a stock browser, "lean" for a headless browser
+            tuned for scraping
+
+    Returns:
+        Chrome options, or None for the stock browser
+    """
+    if profile not in BROWSER_PROFILES:
+        raise ValueError(
+            f"Invalid browser profile. Must be {', '.join(BROWSER_PROFILES)}"
+        )
+    if profile == "default":
+        return None
+
+    options = webdriver.ChromeOptions()
+    for argument in LEAN_ARGUMENTS:
+        options.add_argument(argument)
+    options.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.media_stream": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        },
+    )
+    return options
+
+
+def create_driver(
+    profile: str = "default",
+    options: Optional[webdriver.ChromeOptions] = None,
+    user_data_dir: Optional[str] = None,
+) -> webdriver.Chrome:
+    """Launch Chrome with a profile.
+
+    Args:
+        profile: Browser profile name, see chrome_options
+        options: Optional Chrome options used instead of the profile's own
+        user_data_dir: Optional persistent user-data directory. Its HTTP and
+            code caches and cookies survive the browser, so a browser started
+            on it again loads pages warm. Only one browser may use it at a time.
+
+    Returns:
+        Chrome WebDriver; the lean profile also blocks LEAN_BLOCKED_URLS
+    """
+    if user_data_dir:
+        options = (
+            copy.deepcopy(options)
+            if options
+            else chrome_options(profile) or webdriver.ChromeOptions()
+        )
+        options.add_argument(f"--user-data-dir={os.path.abspath(user_data_dir)}")
+    driver = webdriver.Chrome(options=options or chrome_options(profile))
+    if profile == "lean":
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+    return driver
+
+
+def _child_pids(pid: int) -> List[int]:
+    children: List[int] = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children", encoding="utf-8") as file:
+                children.extend(int(child) for child in file.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def _rss_bytes(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def _process_tree(pid: int) -> List[int]:
+    """Return a process and all of its descendants, parents first."""
+    pids = []
+    pending = [pid]
+    while pending:
+        pid = pending.pop()
+        pids.append(pid)
+        pending.extend(_child_pids(pid))
+    return pids
+
+
+def driver_rss_bytes(driver: webdriver.Chrome) -> Optional[int]:
+    """Measure the resident memory of a driver's browser processes.
+
+    Sums the RSS of chromedriver and every process below it (browser,
+    renderers, GPU and utility processes).
+
+    Args:
+        driver: Chrome WebDriver
+
+    Returns:
+        Resident set size in bytes, or None where /proc is unavailable
+    """
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return None
+    return process_tree_rss_bytes(process.pid)
+
+
+def process_tree_rss_bytes(pid: int) -> Optional[int]:
+    """Measure the resident memory of a process and all of its descendants.
+
+    Args:
+        pid: Id of the root process
+
+    Returns:
+        Resident set size in bytes, or None where /proc is unavailable
+    """
+    if not os.path.isdir(f"/proc/{pid}"):
+        return None
+    return sum(_rss_bytes(pid) for pid in _process_tree(pid))
+
+
+def kill_driver(driver: webdriver.Chrome) -> None:
+    """Kill a driver's chromedriver and browser processes outright.
+
+    Used on wedged browsers that no longer answer WebDriver commands. Calls
+    blocked on the driver fail once chromedriver is gone. Without /proc, only
+    chromedriver itself is killed.
+
+    Args:
+        driver: Chrome WebDriver
+    """
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return
+    # Collect the tree first, as killing a parent reparents its children
+    for pid in _process_tree(process.pid):
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
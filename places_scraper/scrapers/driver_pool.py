@@ -0,0 +1,284 @@
+"""Pool of browser-backed scrapers for parallel review scraping."""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from selenium.common.exceptions import WebDriverException
+
+from .browser_profiles import driver_rss_bytes, kill_driver
+from ..utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPool:
+    """Fixed-size pool of scrapers, each owning its own WebDriver and wait.
+
+    Work items are fed to a thread pool; each task checks out an idle scraper,
+    health-checks its driver (replacing it if the browser died) and returns it
+    to the pool when done. Items are either mapped in bulk or awaited one at a
+    time from the event loop.
+
+    Browsers are recycled to keep long runs stable: a scraper is replaced on
+    its return to the pool once it has served ``max_pages`` checkouts or its
+    browser processes use more than ``max_rss_bytes``. A work item running
+    longer than ``deadline`` seconds has its browser killed, which fails the
+    item, and the scraper is replaced.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[int], Any],
+        size: int = 1,
+        max_pages: Optional[int] = None,
+        max_rss_bytes: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ):
+        """Start the pool's browsers.
+
+        Args:
+            factory: Callable returning a scraper with ``driver`` and
+                ``close()``, called with the index of the pool slot it fills
+            size: Number of browsers to run in parallel
+            max_pages: Checkouts after which a scraper is replaced
+            max_rss_bytes: Resident memory of a browser above which its
+                scraper is replaced
+            deadline: Seconds a work item may run before its browser is killed
+        """
+        if size < 1:
+            raise ValueError("Driver pool size must be at least 1")
+
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_bytes = max_rss_bytes
+        self.deadline = deadline
+        self._idle: queue.Queue = queue.Queue()
+        self._workers: List[Any] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Slot and checkout count of each scraper, and scrapers whose browser
+        # was killed, by scraper id
+        self._slots: Dict[int, int] = {}
+        self._pages: Dict[int, int] = {}
+        self._killed: Set[int] = set()
+
+        # Browsers take seconds to start, so launch them in parallel
+        with ThreadPoolExecutor(max_workers=size) as executor:
+            futures = [executor.submit(factory, slot) for slot in range(size)]
+        try:
+            for future in futures:
+                self._workers.append(future.result())
+        except Exception:
+            for future in futures:
+                if future.exception() is None:
+                    future.result().close()
+            raise
+
+        for slot, worker in enumerate(self._workers):
+            self._slots[id(worker)] = slot
+            self._pages[id(worker)] = 0
+            self._idle.put(worker)
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def is_healthy(worker: Any) -> bool:
+        """Check that a worker's browser still responds.
+
+        Args:
+            worker: Scraper to check
+
+        Returns:
+            True if the driver answered a trivial script
+        """
+        try:
+            return worker.driver.execute_script("return 1") == 1
+        except WebDriverException:
+            return False
+
+    def _replace(self, worker: Any, reason: str) -> Any:
+        """Close a worker and start a fresh one in its slot.
+
+        Args:
+            worker: Scraper to replace
+            reason: Why it is replaced: ``unresponsive``, ``deadline``,
+                ``pages`` or ``memory``
+        """
+        logger.info("Replacing browser in driver pool (%s)", reason)
+        metrics.inc("driver_recycles_total", reason=reason)
+        try:
+            worker.close()
+        except Exception as error:  # pylint: disable=broad-except
+            # Killed browsers fail with connection errors rather than WebDriver ones
+            logger.debug("Could not close the replaced browser: %s", error)
+
+        new_worker = self.factory(self._slots[id(worker)])
+        with self._lock:
+            slot = self._slots.pop(id(worker))
+            del self._pages[id(worker)]
+            self._killed.discard(id(worker))
+            self._workers[slot] = new_worker
+            self._slots[id(new_worker)] = slot
+            self._pages[id(new_worker)] = 0
+        return new_worker
+
+    def _recycle_reason(self, worker: Any) -> Optional[str]:
+        """Return why a worker returning to the pool is due for replacement."""
+        with self._lock:
+            if id(worker) in self._killed:
+                return "deadline"
+            if self.max_pages and self._pages[id(worker)] >= self.max_pages:
+                return "pages"
+        if self.max_rss_bytes:
+            rss = driver_rss_bytes(worker.driver)
+            if rss is not None and rss > self.max_rss_bytes:
+                return "memory"
+        return None
+
+    @contextmanager
+    def acquire(self) -> Iterator[Any]:
+        """Check out a healthy worker for exclusive use.
+
+        Yields:
+            Scraper whose driver is not used by any other thread
+        """
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+
+        worker = self._idle.get()
+        try:
+            if not self.is_healthy(worker):
+                worker = self._replace(worker, "unresponsive")
+            with self._lock:
+                self._pages[id(worker)] += 1
+            yield worker
+        finally:
+            reason = None if self._closed else self._recycle_reason(worker)
+            if reason:
+                try:
+                    worker = self._replace(worker, reason)
+                except Exception as error:  # pylint: disable=broad-except
+                    # Keep the slot; the next checkout retries the replacement
+                    logger.warning(
+                        "Could not start a replacement browser: %s", error,
+                        exc_info=logger.isEnabledFor(logging.DEBUG),
+                    )
+            self._idle.put(worker)
+
+    def _kill(self, worker: Any) -> None:
+        """Kill the browser of a worker that overran its deadline."""
+        with self._lock:
+            if id(worker) not in self._slots:
+                return
+            self._killed.add(id(worker))
+        logger.warning(
+            "Killing a browser stuck for more than %g seconds", self.deadline
+        )
+        kill_driver(worker.driver)
+
+    def _run(self, func: Callable[[Any, Any], Any], item: Any) -> Any:
+        with self.acquire() as worker:
+            if not self.deadline:
+                return func(worker, item)
+
+            # Calls blocked on the browser fail once it is killed
+            timer = threading.Timer(self.deadline, self._kill, (worker,))
+            timer.daemon = True
+            timer.start()
+            try:
+                return func(worker, item)
+            finally:
+                timer.cancel()
+
+    async def run(self, func: Callable[[Any, Any], Any], item: Any) -> Any:
+        """Apply ``func(worker, item)`` on a pool thread, without blocking the loop.
+
+        Args:
+            func: Function called with a checked-out worker and a work item
+            item: Work item
+
+        Returns:
+            The result of ``func``
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.size, thread_name_prefix="driver-pool"
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._run, func, item
+        )
+
+    def map(self, func: Callable[[Any, Any], Any], items: Iterable[Any]) -> Iterator[Any]:
+        """Apply ``func(worker, item)`` to every item across the pool.
+
+        Args:
+            func: Function called with a checked-out worker and a work item
+            items: Work items
+
+        Yields:
+            Results in the order of ``items``, as soon as each one is ready
+        """
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(self._run, func, item) for item in items]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def close(self) -> None:
+        """Quit every browser in the pool."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            try:
+                worker.close()
+            except WebDriverException as error:
+                logger.debug("Could not close browser: %s", error)
+
+
+def driver_pool_from_config(
+    config: Dict[str, Any], factory: Callable[[Optional[str]], Any]
+) -> DriverPool:
+    """Build the driver pool of a browser scraper run.
+
+    Args:
+        config: Configuration dictionary; ``driverPoolSize``,
+            ``browserDataDir``, ``driverMaxPages``, ``driverMaxRssMb`` and
+            ``placeTimeoutSeconds`` configure the pool
+        factory: Callable returning a scraper, called with the persistent
+            user-data directory of its browser, or None without one
+
+    Returns:
+        Pool whose browsers each keep their own directory under
+        ``browserDataDir`` across restarts
+    """
+    data_dir = config.get("browserDataDir")
+    max_rss_mb = config.get("driverMaxRssMb")
+    return DriverPool(
+        lambda slot: factory(
+            os.path.join(data_dir, f"browser{slot}") if data_dir else None
+        ),
+        config.get("driverPoolSize", 1),
+        max_pages=config.get("driverMaxPages"),
+        max_rss_bytes=max_rss_mb * 1024 * 1024 if max_rss_mb else None,
+        deadline=config.get("placeTimeoutSeconds"),
+    )
@@ -1,9 +1,9 @@
 """Google Maps scraping functionality."""
 
-import time
-from typing import Dict, List, Tuple, Any
+import json
+import logging
+from typing import Dict, List, Optional, Set, Tuple, Any
 from bs4 import BeautifulSoup
-from selenium import webdriver
 from selenium.common.exceptions import (
     ElementClickInterceptedException,
     TimeoutException,
@@ -13,26 +13,70 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+from .browser_profiles import create_driver
+from .page_waiter import PageWaiter
+from .review_extractor import ReviewExtractor
 from ..models.place import Place, Review
-from ..utils.debug import debug
+from ..utils.metrics import metrics
+from ..utils.profiling import profiler
+
+logger = logging.getLogger(__name__)
+
+# Root of the Google Maps pages the browser scrapers visit
+MAPS_URL = "https://www.google.com/maps"
+
+# Returns result cards not returned by an earlier call as a compact JSON
+# array, marking them as seen, then scrolls the results feed for more.
+EXTRACT_NEW_CARDS_SCRIPT = """
+const feed = arguments[0];
+const text = (card, selector) => {
+    const element = card.querySelector(selector);
+    return element ? element.textContent.trim() : "";
+};
+const cards = [];
+for (const card of feed.querySelectorAll("div.Nv2PK:not([data-ps-seen])")) {
+    card.setAttribute("data-ps-seen", "");
+    const link = card.querySelector("a");
+    cards.push({
+        name: text(card, ".qBF1Pd"),
+        rating: text(card, ".MW4etd"),
+        href: link ? link.getAttribute("href") || "" : "",
+        reviews: text(card, ".UY7F9"),
+    });
+}
+feed.scrollTop = feed.scrollHeight;
+return JSON.stringify(cards);
+"""
 
 
 class GoogleMapsScraper:
     """Client for Google Maps scraping."""
 
-    def __init__(self, options=None):
+    def __init__(
+        self,
+        options=None,
+        profile: str = "default",
+        maps_url: str = MAPS_URL,
+        user_data_dir: Optional[str] = None,
+    ):
         """Initialize the Google Maps scraper.
 
         Args:
             options: Optional Chrome options
+            profile: Browser profile, "default" or "lean"
+            maps_url: Root URL of the Maps pages to search
+            user_data_dir: Optional persistent user-data directory of the browser
         """
-        self.driver = webdriver.Chrome(options=options)
+        self.maps_url = maps_url
+        self.driver = create_driver(profile, options, user_data_dir)
         self.wait = WebDriverWait(self.driver, 10)
+        self.waiter = PageWaiter(self.driver)
 
     def close(self):
         """Close the browser."""
         if hasattr(self, "driver"):
             self.driver.quit()
+            del self.driver
 
     def __del__(self):
         """Cleanup when the object is destroyed."""
@@ -58,20 +102,33 @@ class GoogleMapsScraper:
             else ""
         )
         link = element.select_one("a").get("href") if element.select_one("a") else ""
+        reviews_element = element.select_one(".UY7F9")
+        reviews_text = reviews_element.text.strip() if reviews_element else ""
+
+        return self.extract_place_card(
+            {"name": name, "rating": rating, "href": link, "reviews": reviews_text}
+        )
+
+    def extract_place_card(self, card: Dict[str, str]) -> Place:
+        """Build a Place from the fields of a search result card.
+
+        Args:
+            card: Card fields as returned by EXTRACT_NEW_CARDS_SCRIPT
 
+        Returns:
+            Place built from the card
+        """
         # Get total reviews from the results list
-        reviews_element = element.select_one(".UY7F9")
         total_reviews = 0
-        if reviews_element:
-            reviews_text = reviews_element.text.strip()
+        if card.get("reviews"):
             # Extract number from text like "1,234 reviews"
-            total_reviews = int("".join(filter(str.isdigit, reviews_text)))
+            total_reviews = int("".join(filter(str.isdigit, card["reviews"])))
 
         place = Place(
-            name=name,
+            name=card.get("name", ""),
             address="",
-            rating=rating,
-            url=link,
+            rating=card.get("rating", ""),
+            url=card.get("href", ""),
             total_reviews=total_reviews,
             phone="",
             website="",
@@ -112,6 +169,7 @@ class GoogleMapsScraper:
         review = Review(author=author, time=date, text=text, rating=rating)
         return review
 
+    @profiler.stage("get_places")
     def get_places(self, config: Dict[str, Any], category_name: str) -> List[Place]:
         """Get places from Google Maps search results.
 
@@ -122,73 +180,118 @@ class GoogleMapsScraper:
         Returns:
             List of dictionaries containing place information
         """
-        places_list = []
         search_query = f'{category_name} in {config["textQuery"]}'
-        url = (
-            f'https://www.google.com/maps/search/{search_query}/@{config["radiusKm"]}z'
+        url = f'{self.maps_url}/search/{search_query}/@{config["radiusKm"]}z'
+        logger.debug("Search URL: %s", url)
+
+        with metrics.timer("navigation_seconds", page="search"):
+            self.driver.get(url)
+
+        places_list = self.collect_places(
+            config["maxPlaces"], config.get("cardExtraction", "script")
         )
-        print(f"\nSearch URL: {url}")
 
-        self.driver.get(url)
-        time.sleep(1)  # Reduced initial wait time
+        logger.info("Found %d places for %s", len(places_list), category_name)
+        return places_list
 
-        # Find the results panel and scroll within it
-        scroll_pause_time = 0.5  # Reduced pause time
+    def collect_places(
+        self, max_places: int, extraction: str = "script"
+    ) -> List[Place]:
+        """Scroll the loaded search results feed and collect its places.
+
+        Args:
+            max_places: Maximum number of places to collect
+            extraction: "script" to pull only unseen cards as JSON with one
+                execute_script per scroll, or "soup" to re-parse the whole
+                page source with BeautifulSoup on every scroll
+
+        Returns:
+            List of Place objects
+        """
+        places_list = []
+        seen_cards = 0
         scroll_attempts = 0
         max_scroll_attempts = 10
 
         # Find the results panel
-        results_panel = self.driver.find_element(By.CSS_SELECTOR, "div[role='feed']")
-        while (
-            scroll_attempts < max_scroll_attempts
-            and len(places_list) < config["maxPlaces"]
-        ):
-            # Scroll within the results panel
-            self.driver.execute_script(
-                "arguments[0].scrollTop = arguments[0].scrollHeight", results_panel
-            )
-            time.sleep(scroll_pause_time)
-
-            # Get current places
-            page_content = self.driver.page_source
-            soup = BeautifulSoup(page_content, "html.parser")
-            data_elements = soup.find_all("div", class_="Nv2PK")
-
-            # Update places list
-            for element in data_elements[
-                len(places_list) :
-            ]:  # Only process new elements
-                if len(places_list) >= config["maxPlaces"]:
-                    break
-                try:
-                    place_info = self.extract_place_info(element)
-                    places_list.append(place_info)
-                except (AttributeError, ValueError) as error:
-                    print(f"Error processing place element: {error}")
-                    continue
-
-            if len(places_list) >= config["maxPlaces"]:
+        results_panel = self.wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='feed']"))
+        )
+        while scroll_attempts < max_scroll_attempts and len(places_list) < max_places:
+            with metrics.timer("parse_seconds", page="search", extraction=extraction):
+                if extraction == "script":
+                    # Collect the cards loaded since the last call; the script
+                    # also scrolls the results panel
+                    cards = json.loads(
+                        self.driver.execute_script(
+                            EXTRACT_NEW_CARDS_SCRIPT, results_panel
+                        )
+                    )
+                    seen_cards += len(cards)
+                    for card in cards[: max_places - len(places_list)]:
+                        try:
+                            places_list.append(self.extract_place_card(card))
+                        except ValueError as error:
+                            logger.warning("Error processing place card: %s", error)
+                else:
+                    # Get current places
+                    page_content = self.driver.page_source
+                    soup = BeautifulSoup(page_content, "html.parser")
+                    data_elements = soup.find_all("div", class_="Nv2PK")
+                    seen_cards = len(data_elements)
+
+                    # Update places list
+                    for element in data_elements[
+                        len(places_list) :
+                    ]:  # Only process new elements
+                        if len(places_list) >= max_places:
+                            break
+                        try:
+                            place_info = self.extract_place_info(element)
+                            places_list.append(place_info)
+                        except (AttributeError, ValueError) as error:
+                            logger.warning("Error processing place card: %s", error)
+                            continue
+
+            if len(places_list) >= max_places:
+                break
+
+            # Wait for the scroll to load more cards; none means the end of the list
+            if (
+                self.waiter.wait_for_nodes(
+                    "div.Nv2PK", seen_cards, scroll=extraction != "script"
+                )
+                <= seen_cards
+            ):
                 break
 
             scroll_attempts += 1
 
-        print(f"Found {len(places_list)} places for {category_name}")
         return places_list
 
-    def get_reviews(self, place_info: Place, max_reviews: int = 100) -> List[Review]:
+    @profiler.stage("get_reviews")
+    def get_reviews(
+        self,
+        place_info: Place,
+        max_reviews: int = 100,
+        known: Optional[Set[str]] = None,
+    ) -> List[Review]:
         """Get reviews for a specific place.
 
         Args:
             place_info: Place object containing place information
             max_reviews: Maximum number of reviews to collect
+            known: Review index of the place for an incremental sync; reviews
+                are then sorted newest first and collected only up to the
+                first one in the index
 
         Returns:
             List of Review objects
         """
         reviews = []
 
-        self.driver.get(place_info.url)
-        time.sleep(1)  # Wait for page to load
+        with metrics.timer("navigation_seconds", page="place"):
+            self.driver.get(place_info.url)
 
         # Click on the "Reviews" tab
         try:
@@ -199,7 +302,7 @@ class GoogleMapsScraper:
             )
             reviews_button.click()
         except (TimeoutException, ElementClickInterceptedException) as error:
-            debug("get_reviews", error)
+            logger.warning("Could not open the reviews of %s: %s", place_info.url, error)
             return reviews
 
         # Get address and phone number
@@ -211,7 +314,7 @@ class GoogleMapsScraper:
             )
             place_info.address = address_element.get_attribute("aria-label") or ""
         except (TimeoutException, NoSuchElementException) as error:
-            debug("get_reviews", error)
+            logger.debug("No address for %s: %s", place_info.url, error)
             place_info.address = ""
 
         try:
@@ -222,14 +325,15 @@ class GoogleMapsScraper:
             )
             place_info.phone = phone_number_element.get_attribute("aria-label") or ""
         except (TimeoutException, NoSuchElementException) as error:
-            debug("get_reviews", error)
+            logger.debug("No phone number for %s: %s", place_info.url, error)
             place_info.phone = ""
 
         # Scroll and collect reviews until we have enough or can't scroll anymore
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
         scroll_attempts = 0
         max_scroll_attempts = 20
-        processed_reviews = set()  # Track processed reviews to avoid duplicates
+        extractor = ReviewExtractor(self.driver, known)
+        if known:
+            extractor.sort_newest()
 
         while len(reviews) < max_reviews and scroll_attempts < max_scroll_attempts:
             try:
@@ -238,68 +342,28 @@ class GoogleMapsScraper:
                     EC.presence_of_element_located((By.CSS_SELECTOR, "div.jftiEf"))
                 )
 
-                # Get current reviews
-                review_divs = self.driver.find_elements(By.CSS_SELECTOR, "div.jftiEf")
-
-                for review_div in review_divs:
-                    if len(reviews) >= max_reviews:
-                        break
-
-                    try:
-                        # Get review content
-                        author = review_div.find_element(
-                            By.CSS_SELECTOR, "div.d4r55"
-                        ).text.strip()
-                        date = review_div.find_element(
-                            By.CSS_SELECTOR, "span.rsqaWe"
-                        ).text.strip()
-                        text = review_div.find_element(
-                            By.CSS_SELECTOR, "span.wiI7pd"
-                        ).text.strip()
-
-                        # Create a unique key for this review
-                        review_key = f"{author}_{date}_{text[:50]}"
-                        if review_key in processed_reviews:
-                            continue
+                # Get the reviews loaded since the last scroll in one round trip
+                with metrics.timer("parse_seconds", page="reviews", extraction="script"):
+                    reviews.extend(extractor.extract_new(max_reviews - len(reviews)))
 
-                        # Get the rating
-                        rating_element = review_div.find_element(
-                            By.CSS_SELECTOR, "span.kvMYJc"
-                        )
-                        rating = (
-                            rating_element.get_attribute("aria-label")
-                            if rating_element
-                            else ""
-                        )
-                        rating = rating.split()[0] if rating else "0"
-
-                        # Create Review object
-                        review = Review(
-                            author=author, text=text, rating=int(rating), time=date
-                        )
-                        reviews.append(review)
-                        processed_reviews.add(review_key)
-                    except Exception as e:
-                        debug("get_reviews", e)
-                        continue
-
-                # Scroll down
-                self.driver.execute_script(
-                    "window.scrollTo(0, document.body.scrollHeight);"
-                )
-                time.sleep(1)  # Wait for new content to load
+                if len(reviews) >= max_reviews or extractor.caught_up:
+                    break
 
-                # Check if we've reached the end
-                new_height = self.driver.execute_script(
-                    "return document.body.scrollHeight"
-                )
-                if new_height == last_height:
+                # Scroll the reviews pane and wait for the next batch; none
+                # means we've reached the end
+                with metrics.timer("review_page_seconds"):
+                    loaded = self.waiter.wait_for_nodes(
+                        "div.jftiEf", extractor.cursor, scroll=True
+                    )
+                if loaded <= extractor.cursor:
                     break
-                last_height = new_height
                 scroll_attempts += 1
 
             except Exception as e:
-                debug("get_reviews", e)
+                logger.warning(
+                    "Stopped collecting reviews of %s: %s", place_info.url, e,
+                    exc_info=logger.isEnabledFor(logging.DEBUG),
+                )
                 break
 
         return reviews
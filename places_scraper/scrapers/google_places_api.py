@@ -1,19 +1,60 @@
 """Google Places API implementation."""
 
-from typing import Dict, List, Any
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List, Any, Optional, Set
+from google.api_core.client_options import ClientOptions
 from google.maps import places_v1
 from dotenv import load_dotenv
 import os
+from ..models.place import Place, Review
 from ..models.query import PlaceSearchQuery
-import time
-from ..utils.debug import debug
+from ..utils.cache import ResponseCache, cache_from_config
+from ..utils.geo import SearchArea, Tile, parse_location
+from ..utils.metrics import metrics
+from ..utils.profiling import profiler
+from ..utils.rate_limiter import RateLimiter
+from .places_api_convert import places_from_response, reviews_from_place
+
+logger = logging.getLogger(__name__)
+
+# Most places a single searchText request returns
+SEARCH_PAGE_SIZE = 20
+
+# How many times a saturated tile may be split into quadrants
+DEFAULT_MAX_TILE_DEPTH = 3
 
 
 class GooglePlacesAPI:
     """Client for Google Places API."""
 
-    def __init__(self):
-        """Initialize the Places API client."""
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        client: Optional[places_v1.PlacesAsyncClient] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
+        """Initialize the Places API client.
+
+        Args:
+            config: Optional configuration dictionary; ``rateLimits`` sets the
+                per-endpoint QPS and burst, ``cache`` enables the response cache,
+                ``maxTileDepth`` and ``maxConcurrency`` tune tiled searches
+            client: Optional preconfigured Places client
+            rate_limiter: Optional rate limiter, overrides ``rateLimits``
+            cache: Optional response cache, overrides ``cache``
+        """
+        config = config or {}
+        self.rate_limiter = rate_limiter or RateLimiter(config.get("rateLimits"))
+        self.cache = cache if cache is not None else cache_from_config(config)
+        self.max_tile_depth = config.get("maxTileDepth", DEFAULT_MAX_TILE_DEPTH)
+        self.max_concurrency = config.get("maxConcurrency", 1)
+
+        if client is not None:
+            self.client = client
+            return
+
         # Load .env from the root directory
         env_path = os.path.join(
             os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".env"
@@ -28,9 +69,34 @@ class GooglePlacesAPI:
 
         # Initialize the Places client
         self.client = places_v1.PlacesAsyncClient(
-            client_options={"api_key": self.api_key}
+            client_options=ClientOptions(api_key=self.api_key)
         )
 
+    async def _request(
+        self, endpoint: str, method: Any, request: Any, field_mask: List[str]
+    ) -> Any:
+        """Call an endpoint once its quota allows, recording the call in metrics.
+
+        Args:
+            endpoint: Endpoint name, "searchText" or "getPlace"
+            method: Client method of the endpoint
+            request: Request message
+            field_mask: Requested response fields
+
+        Returns:
+            Response message
+        """
+        await self.rate_limiter.acquire(endpoint)
+        metrics.inc("api_requests_total", endpoint=endpoint)
+        try:
+            with metrics.timer("api_request_seconds", endpoint=endpoint):
+                return await method(
+                    request, metadata=[("x-goog-fieldmask", ",".join(field_mask))]
+                )
+        except Exception:
+            metrics.inc("api_errors_total", endpoint=endpoint)
+            raise
+
     async def search_places(self, query: PlaceSearchQuery) -> Dict[str, Any]:
         """Search for places using the Places API.
 
@@ -38,24 +104,28 @@ class GooglePlacesAPI:
             query: PlaceSearchQuery object containing search parameters
 
         Returns:
-            Raw API response containing places data
+            Dictionary with the Place records found under "places"
         """
-        radius_m = query.get("radiusKm", 0.5) * 1000
-        location = query.get("location", None)
-        location_bias = {
-            "circle": {
-                "center": {"latitude": location[1], "longitude": location[0]},
-                "radius": radius_m,
-            }
-        }
-
         # Specify the fields to retrieve
         request = places_v1.SearchTextRequest(
             text_query=query["textQuery"],
-            location_bias=location_bias,
-            max_result_count=min(20, query["maxPlaces"]),
+            max_result_count=min(SEARCH_PAGE_SIZE, query["maxPlaces"]),
             language_code=query.get("languageCode", "en"),
         )
+        if query.get("rectangle"):
+            request.location_restriction = (
+                places_v1.SearchTextRequest.LocationRestriction(
+                    rectangle=query["rectangle"]
+                )
+            )
+        else:
+            latitude, longitude = parse_location(query["location"])
+            request.location_bias = places_v1.SearchTextRequest.LocationBias(
+                circle=places_v1.Circle(
+                    center={"latitude": latitude, "longitude": longitude},
+                    radius=query["radius"],
+                )
+            )
 
         field_mask = [
             "places.id",
@@ -67,132 +137,201 @@ class GooglePlacesAPI:
             "places.types",
         ]
 
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(
+                "searchText", places_v1.SearchTextRequest.to_dict(request), field_mask
+            )
+            cached = self.cache.get("searchText", cache_key)
+            if cached is not None:
+                with profiler.stage("search_places"):
+                    return {
+                        "places": [Place.from_dict(place) for place in cached["places"]]
+                    }
+
         try:
             # Make the API call
-            print("Making API call...")
-            response = await self.client.search_text(
-                request, metadata=[("x-goog-fieldmask", ",".join(field_mask))]
+            response = await self._request(
+                "searchText", self.client.search_text, request, field_mask
             )
 
-            # Convert the response to the expected format
-            places = []
-            for place in response.places:
-                place_data = {
-                    "id": place.id,
-                    "displayName": {
-                        "text": str(place.display_name.text),
-                        "languageCode": str(place.display_name.language_code),
-                    },
-                    "formattedAddress": place.formatted_address,
-                    "location": {
-                        "latitude": place.location.latitude,
-                        "longitude": place.location.longitude,
-                    },
-                    "rating": place.rating if hasattr(place, "rating") else None,
-                    "userRatingCount": (
-                        place.user_rating_count
-                        if hasattr(place, "user_rating_count")
-                        else None
-                    ),
-                    "types": ", ".join(place.types) if hasattr(place, "types") else "",
-                    "primaryType": (
-                        place.primary_type if hasattr(place, "primary_type") else None
-                    ),
-                }
-                places.append(place_data)
-
-            return {
-                "places": places,
-                "nextPageToken": (
-                    response.next_page_token
-                    if hasattr(response, "next_page_token")
-                    else None
-                ),
-            }
+            with profiler.stage("search_places"):
+                places = places_from_response(response)
+                if self.cache is not None and cache_key is not None:
+                    self.cache.set(
+                        "searchText",
+                        cache_key,
+                        {"places": [place.to_dict() for place in places]},
+                    )
+            return {"places": places}
 
         except Exception as e:
-            debug("search_places", e)
-            return {"places": [], "nextPageToken": None}
+            logger.warning(
+                "Search for %r failed: %s", query["textQuery"], e,
+                exc_info=logger.isEnabledFor(logging.DEBUG),
+            )
+            return {"places": []}
+
+    async def _search(
+        self, query: PlaceSearchQuery, semaphore: Optional[asyncio.Semaphore]
+    ) -> Dict[str, Any]:
+        """Run search_places, holding the semaphore if one is given."""
+        if semaphore is None:
+            return await self.search_places(query)
+        async with semaphore:
+            return await self.search_places(query)
+
+    async def iter_places(
+        self,
+        query: PlaceSearchQuery,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> AsyncIterator[Place]:
+        """Yield the places of a search as they arrive, up to ``maxPlaces``.
+
+        Searches for more places than fit in one request are tiled when
+        ``maxTileDepth`` allows it. Otherwise a single request is made, as
+        the Places client cannot request further pages of a search.
+
+        Args:
+            query: PlaceSearchQuery object containing search parameters
+            semaphore: Optional limit on in-flight searches; tiled searches
+                default to ``maxConcurrency``
+
+        Yields:
+            Places found, in search order
+        """
+        if query["maxPlaces"] > SEARCH_PAGE_SIZE and self.max_tile_depth > 0:
+            async for place in self._iter_tiles(
+                query, semaphore or asyncio.Semaphore(self.max_concurrency)
+            ):
+                yield place
+            return
+
+        response = await self._search(query, semaphore)
+        for place in response["places"][: query["maxPlaces"]]:
+            yield place
+
+    async def _iter_tiles(
+        self, query: PlaceSearchQuery, semaphore: asyncio.Semaphore
+    ) -> AsyncIterator[Place]:
+        """Search an area beyond the single-request result cap.
+
+        A single searchText request returns at most SEARCH_PAGE_SIZE places.
+        The search area is covered with rectangular tiles, starting from its
+        bounding box. Each level of tiles is searched concurrently, and tiles
+        that come back full are split into quadrants and searched again, up to
+        ``maxTileDepth`` times. Sparse tiles are never split, so the number of
+        calls follows place density. Places are deduplicated by id and kept
+        only if they lie inside the circle or polygon.
+
+        Args:
+            query: PlaceSearchQuery object containing search parameters
+            semaphore: Limits the number of in-flight searches
+
+        Yields:
+            Places found, a level of tiles at a time
+        """
+        area = SearchArea.from_query(query)
+        tile_query: PlaceSearchQuery = {**query, "maxPlaces": SEARCH_PAGE_SIZE}
+
+        async def search_tile(tile: Tile) -> List[Place]:
+            response = await self._search(
+                {**tile_query, "rectangle": tile.to_rectangle()}, semaphore
+            )
+            return response.get("places", [])
+
+        seen: Set[str] = set()
+        tiles = [area.bounding_tile()]
+        searched = 0
+        while tiles and len(seen) < query["maxPlaces"]:
+            results = await asyncio.gather(*(search_tile(tile) for tile in tiles))
+            searched += len(tiles)
+
+            saturated = []
+            for tile, tile_places in zip(tiles, results):
+                for place in tile_places:
+                    if (
+                        place.place_id not in seen
+                        and len(seen) < query["maxPlaces"]
+                        and place.latitude is not None
+                        and place.longitude is not None
+                        and area.contains(place.latitude, place.longitude)
+                    ):
+                        seen.add(place.place_id)
+                        yield place
+                if len(tile_places) >= SEARCH_PAGE_SIZE and tile.depth < self.max_tile_depth:
+                    saturated.append(tile)
+
+            tiles = [
+                child
+                for tile in saturated
+                for child in tile.split()
+                if area.intersects(child)
+            ]
+
+        logger.info("Tiled search found %d places in %d tiles", len(seen), searched)
 
     async def get_reviews(
         self, place_id: str, max_reviews: int = 100
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Review]:
         """Get reviews for a place using its ID.
 
         Args:
             place_id: Google Places place_id
-            max_reviews: Maximum number of reviews to fetch (default: 100)
+            max_reviews: Maximum number of reviews to return; getPlace returns
+                at most 5 (default: 100)
 
         Returns:
-            List of review data
+            List of Review objects
         """
-        all_reviews = []
+        # Define the fields to retrieve
+        field_mask = ["reviews"]
 
-        try:
-            while len(all_reviews) < max_reviews:
-                # Create the request
-                request = places_v1.GetPlaceRequest(
-                    name=f"places/{place_id}",
-                )
-
-                # Define the fields to retrieve
-                field_mask = ["reviews"]
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(
+                "getPlace", {"name": f"places/{place_id}", "maxReviews": max_reviews},
+                field_mask,
+            )
+            cached = self.cache.get("getPlace", cache_key)
+            if cached is not None:
+                with profiler.stage("get_reviews"):
+                    return [Review.from_dict(review) for review in cached]
 
-                print(f"Fetching reviews page {len(all_reviews) // 5 + 1}...")
-                response = await self.client.get_place(
-                    request, metadata=[("x-goog-fieldmask", ",".join(field_mask))]
+        try:
+            # getPlace returns the same few most relevant reviews on every call,
+            # so a single request fetches all there is
+            request = places_v1.GetPlaceRequest(name=f"places/{place_id}")
+            with metrics.timer("review_page_seconds"):
+                response = await self._request(
+                    "getPlace", self.client.get_place, request, field_mask
                 )
 
-                # Process reviews
-                reviews = response.reviews if hasattr(response, "reviews") else []
-                for review in reviews:
-                    review_data = {
-                        "name": review.name,
-                        "relative_publish_time_description": review.relative_publish_time_description,
-                        "rating": review.rating,
-                        "text": (
-                            {
-                                "text": str(review.text.text),
-                                "language_code": str(review.text.language_code),
-                            }
-                            if hasattr(review, "text")
-                            else None
-                        ),
-                        "original_text": (
-                            {
-                                "text": str(review.original_text.text),
-                                "language_code": str(
-                                    review.original_text.language_code
-                                ),
-                            }
-                            if hasattr(review, "original_text")
-                            else None
-                        ),
-                        "author_attribution": (
-                            {
-                                "display_name": str(
-                                    review.author_attribution.display_name
-                                ),
-                                "uri": str(review.author_attribution.uri),
-                                "photo_uri": str(review.author_attribution.photo_uri),
-                            }
-                            if hasattr(review, "author_attribution")
-                            else None
-                        ),
-                        "publish_time": (
-                            review.publish_time.isoformat()
-                            if hasattr(review, "publish_time")
-                            else None
-                        ),
-                    }
-                    all_reviews.append(review_data)
-
-                # Small delay before next request to avoid rate limiting
-                time.sleep(1)
+            with profiler.stage("get_reviews"):
+                all_reviews = reviews_from_place(response)[:max_reviews]
 
-            print(f"Total reviews fetched: {len(all_reviews)}")
+            logger.debug("Fetched %d reviews of %s", len(all_reviews), place_id)
+            if self.cache is not None and cache_key is not None:
+                with profiler.stage("get_reviews"):
+                    self.cache.set(
+                        "getPlace",
+                        cache_key,
+                        [review.to_dict() for review in all_reviews],
+                    )
             return all_reviews
 
         except Exception as e:
-            debug("get_reviews", e)
+            logger.warning(
+                "Fetching the reviews of %s failed: %s", place_id, e,
+                exc_info=logger.isEnabledFor(logging.DEBUG),
+            )
             return []
+
+    def stats(self) -> Dict[str, int]:
+        """Return client counters for the run summary."""
+        return self.cache.stats() if self.cache is not None else {}
+
+    def close(self) -> None:
+        """Release the response cache."""
+        if self.cache is not None:
+            self.cache.close()
@@ -1,9 +1,9 @@
 """Hybrid scraper implementation using Places API and Selenium."""
 
+import asyncio
+import logging
 import time
-import json
-from typing import Dict, Any, List, Tuple
-from selenium import webdriver
+from typing import AsyncIterator, Dict, Any, List, Optional, Set, Tuple
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -13,28 +13,98 @@ from selenium.common.exceptions import (
     ElementClickInterceptedException,
 )
 
+from .browser_profiles import create_driver
+from .driver_pool import driver_pool_from_config
+from .google_maps_scraper import MAPS_URL
 from .google_places_api import GooglePlacesAPI
+from .page_waiter import PageWaiter
+from .review_extractor import ReviewExtractor
 from ..models.place import Place, Review
-from ..utils.debug import debug
+from ..models.query import PlaceSearchQuery
+from ..utils.checkpoint import RunManifest
+from ..utils.registry import PlaceRegistry, canonical_maps_url
+from ..utils.sinks import BackgroundSink
+from ..utils.metrics import metrics, record_place
+from ..utils.place_store import place_store_from_config
+from ..utils.profiling import profiler
+
+logger = logging.getLogger(__name__)
+
+# Places queued for review scraping per browser before searches wait
+DEFAULT_PIPELINE_QUEUE_SIZE = 2
+
+
+async def iter_category_places(
+    api: GooglePlacesAPI,
+    config: Dict[str, Any],
+    category: str,
+    maps_url: str = MAPS_URL,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> AsyncIterator[Place]:
+    """Search the places of a category, yielding them as pages arrive.
+
+    Args:
+        api: Places API client
+        config: Configuration dictionary
+        category: Category to search for
+        maps_url: Root URL of the Maps place pages to scrape reviews from
+        semaphore: Optional limit on in-flight searches
+
+    Yields:
+        Places found, with their category and Maps URL set
+    """
+    # Create search query
+    query = PlaceSearchQuery(
+        textQuery=category + ", " + config["textQuery"],
+        maxPlaces=config["maxPlaces"],
+        location=config.get(
+            "location", "10.738727, 106.711703"
+        ),  # Default to District 7
+        radius=config["radiusKm"] * 1000,  # Convert km to meters
+        polygon=config.get("polygon", None),
+        languageCode=config.get("languageCode", "en"),
+    )
+
+    # Search for places, tiling the area when maxPlaces exceeds one page
+    async for place in api.iter_places(query, semaphore):
+        place.category = category
+        place.url = f"{maps_url}/place/?q=place_id:{place.place_id}"
+        yield place
 
 
 class HybridScraper:
     """Hybrid scraper using Places API for places and Selenium for reviews."""
 
-    def __init__(self, options=None):
+    def __init__(
+        self,
+        options=None,
+        config: Optional[Dict[str, Any]] = None,
+        api: Optional[GooglePlacesAPI] = None,
+        profile: str = "default",
+        maps_url: str = MAPS_URL,
+        user_data_dir: Optional[str] = None,
+    ):
         """Initialize the hybrid scraper.
 
         Args:
             options: Optional Chrome options for Selenium
+            config: Optional configuration dictionary for the Places API client
+            api: Optional Places API client to share between scrapers
+            profile: Browser profile, "default" or "lean"
+            maps_url: Root URL of the Maps place pages to scrape reviews from
+            user_data_dir: Optional persistent user-data directory of the browser
         """
-        self.api = GooglePlacesAPI()
-        self.driver = webdriver.Chrome(options=options)
+        self.maps_url = maps_url
+        self.api = api or GooglePlacesAPI(config)
+        self.driver = create_driver(profile, options, user_data_dir)
         self.wait = WebDriverWait(self.driver, 10)
+        self.waiter = PageWaiter(self.driver)
 
     def close(self):
         """Close the browser."""
         if hasattr(self, "driver"):
             self.driver.quit()
+            del self.driver
 
     def __del__(self):
         """Cleanup when the object is destroyed."""
@@ -52,51 +122,36 @@ class HybridScraper:
         Returns:
             List of Place objects
         """
-        # Create search query
-        query = {
-            "textQuery": category_name + ", " + config["textQuery"],
-            "maxPlaces": config["maxPlaces"],
-            "location": config.get(
-                "location", "10.738727, 106.711703"
-            ),  # Default to District 7
-            "radius": config["radiusKm"] * 1000,  # Convert km to meters
-            "polygon": config.get("polygon", None),
-        }
-
-        # Search for places
-        response = await self.api.search_places(query)
-        places = response.get("places", [])
-
-        # Convert API response to Place objects
-        place_objects = []
-        for place_data in places:
-            place = Place(
-                name=place_data.get("displayName", {}).get("text", ""),
-                address=place_data.get("formattedAddress", ""),
-                phone=place_data.get("nationalPhoneNumber", ""),
-                website=place_data.get("websiteUri", ""),
-                rating=place_data.get("rating", 0.0),
-                total_reviews=place_data.get("userRatingCount", 0),
-                url=f"https://www.google.com/maps/place/?q=place_id:{place_data['id']}",
-                category=category_name,
+        return [
+            place
+            async for place in iter_category_places(
+                self.api, config, category_name, self.maps_url
             )
-            place_objects.append(place)
-
-        return place_objects
-
-    def get_reviews(self, place_info: Place, max_reviews: int = 100) -> List[Review]:
+        ]
+
+    @profiler.stage("get_reviews")
+    def get_reviews(
+        self,
+        place_info: Place,
+        max_reviews: int = 100,
+        known: Optional[Set[str]] = None,
+    ) -> List[Review]:
         """Get reviews using Selenium.
 
         Args:
             place_info: Place object containing place information
             max_reviews: Maximum number of reviews to collect
+            known: Review index of the place for an incremental sync; reviews
+                are then sorted newest first and collected only up to the
+                first one in the index
 
         Returns:
             List of Review objects
         """
         reviews = []
 
-        self.driver.get(place_info.url)
+        with metrics.timer("navigation_seconds", page="place"):
+            self.driver.get(place_info.url)
         self.wait.until(
             EC.element_to_be_clickable(
                 (By.CSS_SELECTOR, "button[aria-label*='Reviews for']")
@@ -112,14 +167,15 @@ class HybridScraper:
             )
             reviews_button.click()
         except (TimeoutException, ElementClickInterceptedException) as error:
-            debug("get_reviews", error)
+            logger.warning("Could not open the reviews of %s: %s", place_info.url, error)
             return reviews
 
         # Scroll and collect reviews until we have enough or can't scroll anymore
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
         scroll_attempts = 0
         max_scroll_attempts = 20
-        processed_reviews = set()  # Track processed reviews to avoid duplicates
+        extractor = ReviewExtractor(self.driver, known)
+        if known:
+            extractor.sort_newest()
 
         while len(reviews) < max_reviews and scroll_attempts < max_scroll_attempts:
             try:
@@ -128,117 +184,239 @@ class HybridScraper:
                     EC.presence_of_element_located((By.CSS_SELECTOR, "div.jftiEf"))
                 )
 
-                # Get current reviews
-                review_divs = self.driver.find_elements(By.CSS_SELECTOR, "div.jftiEf")
-
-                for review_div in review_divs:
-                    if len(reviews) >= max_reviews:
-                        break
-
-                    try:
-                        # Get review content
-                        author = review_div.find_element(
-                            By.CSS_SELECTOR, "div.d4r55"
-                        ).text.strip()
-                        date = review_div.find_element(
-                            By.CSS_SELECTOR, "span.rsqaWe"
-                        ).text.strip()
-                        text = review_div.find_element(
-                            By.CSS_SELECTOR, "span.wiI7pd"
-                        ).text.strip()
-
-                        # Create a unique key for this review
-                        review_key = f"{author}_{date}_{text[:50]}"
-                        if review_key in processed_reviews:
-                            continue
-
-                        # Get the rating
-                        rating_element = review_div.find_element(
-                            By.CSS_SELECTOR, "span.kvMYJc"
-                        )
-                        rating = (
-                            rating_element.get_attribute("aria-label")
-                            if rating_element
-                            else ""
-                        )
-                        rating = rating.split()[0] if rating else "0"
-
-                        # Create Review object
-                        review = Review(
-                            author=author, text=text, rating=int(rating), time=date
-                        )
-                        reviews.append(review)
-                        processed_reviews.add(review_key)
-                    except (
-                        NoSuchElementException,
-                        StaleElementReferenceException,
-                    ) as e:
-                        continue
-
-                # Scroll down
-                self.driver.execute_script(
-                    "window.scrollTo(0, document.body.scrollHeight);"
-                )
-                time.sleep(1)  # Wait for new content to load
+                # Get the reviews loaded since the last scroll in one round trip
+                with metrics.timer("parse_seconds", page="reviews", extraction="script"):
+                    reviews.extend(extractor.extract_new(max_reviews - len(reviews)))
 
-                # Check if we've reached the end
-                new_height = self.driver.execute_script(
-                    "return document.body.scrollHeight"
-                )
-                if new_height == last_height:
+                if len(reviews) >= max_reviews or extractor.caught_up:
+                    break
+
+                # Scroll the reviews pane and wait for the next batch; none
+                # means we've reached the end
+                with metrics.timer("review_page_seconds"):
+                    loaded = self.waiter.wait_for_nodes(
+                        "div.jftiEf", extractor.cursor, scroll=True
+                    )
+                if loaded <= extractor.cursor:
                     break
-                last_height = new_height
                 scroll_attempts += 1
 
             except Exception as e:
-                debug("get_reviews", e)
+                logger.warning(
+                    "Stopped collecting reviews of %s: %s", place_info.url, e,
+                    exc_info=logger.isEnabledFor(logging.DEBUG),
+                )
                 break
 
         return reviews
 
 
 async def run_hybrid_scraper(
-    config: Dict[str, Any], output_file
-) -> Tuple[float, List[float]]:
+    config: Dict[str, Any],
+    sink: BackgroundSink,
+    manifest: RunManifest,
+    api: Optional[GooglePlacesAPI] = None,
+) -> Dict[str, int]:
     """Run the hybrid scraper.
 
+    Searching and review scraping run as a pipeline. The categories are
+    searched concurrently, with at most ``maxConcurrency`` Places API calls
+    in flight, and each distinct place is queued for review scraping as soon
+    as a search page yields it. A pool of ``driverPoolSize`` browsers takes
+    places off the queue on worker threads, so the event loop keeps
+    searching meanwhile. The queue holds at most ``pipelineQueueSize``
+    places, so searches wait while the browsers are behind. Places are
+    written once every search is done, in category order and then search
+    order, with all of their categories.
+
+    In refresh mode, only places whose rating or review count changed since
+    they were last stored have their reviews scraped. With incremental review
+    sync, only reviews newer than the stored ones are scraped.
+
     Args:
         config: Configuration dictionary
-        output_file: File object to write results to
-    """
-    scraper = HybridScraper()
-    start_time = time.time()
-    place_times = []
+        sink: Output sink to stream places into
+        manifest: Checkpoint manifest; categories and places it lists are skipped
+        api: Optional Places API client, built from the config by default
 
-    try:
-        results = {}
-        for category in config["categories"]:
-            places = await scraper.get_places(config, category)
-            for place in places:
-                place_start = time.time()
-                print(f"Getting reviews for {place.name} ({place.url})")
-                reviews = scraper.get_reviews(
-                    place, max_reviews=config.get("maxReviews", 100)
+    Returns:
+        Run counters for the summary
+    """
+    api = api or GooglePlacesAPI(config)
+    maps_url = config.get("mapsUrl", MAPS_URL)
+    pool = driver_pool_from_config(
+        config,
+        lambda user_data_dir: HybridScraper(
+            config=config,
+            api=api,
+            profile=config.get("browserProfile", "default"),
+            maps_url=maps_url,
+            user_data_dir=user_data_dir,
+        ),
+    )
+    # Stored places are keyed by Places id, like in api mode. Selenium mode
+    # only knows Maps URLs and keys them by those, so it keeps separate entries.
+    store = place_store_from_config(config)
+    refresh = config.get("refresh", False)
+    incremental = config.get("reviewSync", "full") == "incremental"
+    max_reviews = config.get("maxReviews", 100)
+    registry = PlaceRegistry()
+    semaphore = asyncio.Semaphore(config.get("maxConcurrency", 1))
+    places_queue: asyncio.Queue = asyncio.Queue(
+        config.get("pipelineQueueSize", DEFAULT_PIPELINE_QUEUE_SIZE * pool.size)
+    )
+    scraped: Dict[str, asyncio.Future] = {}
+    # Distinct places found so far, and each category's places in search order
+    seen: Dict[str, Place] = {}
+    found: Dict[str, List[Tuple[str, Place]]] = {}
+    # Seconds spent searching, waiting on the full queue and scraping, summed
+    # over the concurrent searches and browsers
+    busy = {"search": 0.0, "scrape": 0.0}
+    blocked = 0.0
+    loop = asyncio.get_running_loop()
+
+    def scrape_place(scraper: HybridScraper, place: Place) -> float:
+        place_start = time.time()
+        known = (
+            store.review_keys(place.place_id)
+            if store is not None and incremental
+            else None
+        )
+        try:
+            reviews = scraper.get_reviews(place, max_reviews=max_reviews, known=known)
+        except Exception as e:
+            logger.warning(
+                "Error scraping the reviews of %s: %s", place.url, e,
+                exc_info=logger.isEnabledFor(logging.DEBUG),
+            )
+            metrics.inc("place_errors_total")
+            reviews = []
+            known = None
+        if known and store is not None:
+            # Follow the new reviews with the newest stored ones
+            reviews += store.reviews(place.place_id, max_reviews - len(reviews))
+        place_time = time.time() - place_start
+        logger.debug(
+            "Processed %d reviews for %s in %.2f seconds",
+            len(reviews), place.name, place_time,
+        )
+        place.reviews = reviews
+        if store is not None:
+            store.put(place)
+        return place_time
+
+    async def search(category: str) -> None:
+        nonlocal blocked
+        places = found[category] = []
+        with metrics.timer("search_seconds", category=category):
+            search_start = time.perf_counter()
+            async for place in iter_category_places(
+                api, config, category, maps_url, semaphore
+            ):
+                key = canonical_maps_url(place.url)
+                if key in seen:
+                    # Already queued under another category
+                    places.append((key, seen[key]))
+                    continue
+                seen[key] = place
+                places.append((key, place))
+                if manifest.is_place_done(key):
+                    continue
+
+                scraped[key] = loop.create_future()
+                reviews = (
+                    store.unchanged_reviews(place, limit=max_reviews)
+                    if store is not None and refresh
+                    else None
                 )
-                place_time = time.time() - place_start
-                place_times.append(place_time)
-                # printout process time and number of reviews
-                print(
-                    f"Processed {len(reviews)} reviews for {place.name} in ({place_time:.2f} seconds)"
+                if reviews is not None:
+                    place.reviews = reviews
+                    scraped[key].set_result(0.0)
+                    continue
+
+                # Wait for room in the queue while the browsers are behind
+                metrics.observe("pipeline_queue_depth", places_queue.qsize(), stage="scrape")
+                put_start = time.perf_counter()
+                await places_queue.put((key, place))
+                blocked += time.perf_counter() - put_start
+            busy["search"] += time.perf_counter() - search_start
+        metrics.inc("places_found_total", len(places), category=category)
+
+    async def scrape() -> None:
+        while True:
+            key, place = await places_queue.get()
+            scrape_start = time.perf_counter()
+            try:
+                scraped[key].set_result(await pool.run(scrape_place, place))
+            except Exception as error:  # pylint: disable=broad-except
+                # E.g. no browser could be started; write the place without reviews
+                logger.warning(
+                    "Error scraping the reviews of %s: %s", place.url, error,
+                    exc_info=logger.isEnabledFor(logging.DEBUG),
                 )
-                place.reviews = reviews
-            results[category] = places
-
-        # Save results
-        for category, places in results.items():
-            if category != config["categories"][0]:
-                output_file.write(",\n")
-            json.dump(
-                [place.to_dict() for place in places],
-                output_file,
-                ensure_ascii=False,
-            )
+                metrics.inc("place_errors_total")
+                place.reviews = []
+                scraped[key].set_result(time.perf_counter() - scrape_start)
+            finally:
+                busy["scrape"] += time.perf_counter() - scrape_start
+                places_queue.task_done()
+
+    pipeline_start = time.perf_counter()
+    scrapers = [asyncio.create_task(scrape()) for _ in range(pool.size)]
+    try:
+        categories = [
+            category
+            for category in config["categories"]
+            if not manifest.is_category_done(category)
+        ]
+        await asyncio.gather(*(search(category) for category in categories))
+        # Register the results in category order, as searches finish in any order
+        for category in categories:
+            registry.register(category, found[category])
+
+        pending = []
+        for key, place in registry:
+            if key in scraped:
+                pending.append((key, place))
+            else:
+                registry.mark_written(key)
+        for category in registry.drain_finished():
+            sink.end_category(category)
+
+        # Save results in registration order
+        for key, place in pending:
+            place_time = await scraped[key]
+            place.categories = registry.categories(key)
+            place.category = place.categories[0]
+            sink.write(place, key)
+            record_place(place.category, place_time, len(place.reviews))
+            registry.mark_written(key)
+
+            for category in registry.drain_finished():
+                sink.end_category(category)
+
+        # Report the share of each stage's time spent working: searches not
+        # waiting on the full queue, and browsers over the whole run
+        elapsed = time.perf_counter() - pipeline_start
+        search_utilization = 1 - blocked / busy["search"] if busy["search"] else 1.0
+        scrape_utilization = busy["scrape"] / (elapsed * pool.size)
+        metrics.set("pipeline_utilization", search_utilization, stage="search")
+        metrics.set("pipeline_utilization", scrape_utilization, stage="scrape")
+        metrics.set("pipeline_blocked_seconds", blocked, stage="search")
+        logger.info(
+            "Pipeline utilization: searches %.0f%% (%.1f seconds waiting for "
+            "browsers), %d browsers %.0f%%",
+            search_utilization * 100, blocked, pool.size, scrape_utilization * 100,
+        )
+        logger.info("Review fetches saved by deduplication: %d", registry.fetches_saved)
     finally:
-        scraper.close()
-
-    return start_time, place_times
+        for task in scrapers:
+            task.cancel()
+        pool.close()
+        stats = {**api.stats(), "review_fetches_saved": registry.fetches_saved}
+        api.close()
+        if store is not None:
+            stats.update(store.stats())
+            store.close()
+
+    return stats
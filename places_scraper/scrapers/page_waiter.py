@@ -0,0 +1,120 @@
+"""Event-driven waits for content appended to a page."""
+
+import time
+from typing import Optional
+
+# Optionally scrolls the scrollable ancestor of the last matching node, then
+# resolves with the node count as soon as it exceeds the baseline, or when the
+# timeout expires. Uses a MutationObserver rather than polling.
+WAIT_FOR_NODES_SCRIPT = """
+const [nodeSelector, baseline, timeoutMs, scroll] = arguments;
+const done = arguments[arguments.length - 1];
+const count = () => document.querySelectorAll(nodeSelector).length;
+
+if (scroll) {
+    const nodes = document.querySelectorAll(nodeSelector);
+    let target = nodes.length ? nodes[nodes.length - 1].parentElement : null;
+    while (target && !(target.scrollHeight > target.clientHeight &&
+            /(auto|scroll)/.test(getComputedStyle(target).overflowY))) {
+        target = target.parentElement;
+    }
+    target = target || document.scrollingElement || document.body;
+    target.scrollTop = target.scrollHeight;
+}
+
+if (count() > baseline) {
+    done(count());
+} else {
+    let timer = null;
+    const observer = new MutationObserver(() => {
+        if (count() > baseline) finish();
+    });
+    const finish = () => {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(count());
+    };
+    observer.observe(document.body, {childList: true, subtree: true});
+    timer = setTimeout(finish, timeoutMs);
+}
+"""
+
+
+class PageWaiter:
+    """Waits for new nodes to appear instead of sleeping for a fixed time.
+
+    The timeout adapts to the page: it tracks a moving average of how long
+    new nodes took to appear and allows a multiple of it, within bounds.
+    """
+
+    def __init__(
+        self,
+        driver,
+        initial_timeout: float = 5.0,
+        min_timeout: float = 1.0,
+        max_timeout: float = 10.0,
+        factor: float = 4.0,
+        smoothing: float = 0.3,
+    ):
+        """Initialize the waiter.
+
+        Args:
+            driver: WebDriver to wait on
+            initial_timeout: Timeout in seconds before any latency is observed
+            min_timeout: Lower bound of the adaptive timeout in seconds
+            max_timeout: Upper bound of the adaptive timeout in seconds
+            factor: Multiple of the average latency allowed before giving up
+            smoothing: Weight of the newest latency in the moving average
+        """
+        self.driver = driver
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.factor = factor
+        self.smoothing = smoothing
+        self.average_latency: Optional[float] = None
+        self._initial_timeout = initial_timeout
+
+        # execute_async_script must outlive the longest wait
+        self.driver.set_script_timeout(max_timeout + 5)
+
+    @property
+    def timeout(self) -> float:
+        """Current wait timeout in seconds."""
+        if self.average_latency is None:
+            return self._initial_timeout
+        return min(
+            self.max_timeout,
+            max(self.min_timeout, self.factor * self.average_latency),
+        )
+
+    def wait_for_nodes(
+        self, node_selector: str, baseline: int, scroll: bool = False
+    ) -> int:
+        """Wait until more than ``baseline`` nodes match ``node_selector``.
+
+        Args:
+            node_selector: CSS selector of the nodes to count
+            baseline: Node count to exceed
+            scroll: Scroll the container of the nodes to the bottom first
+
+        Returns:
+            Number of matching nodes; not above ``baseline`` on timeout
+        """
+        start = time.monotonic()
+        count = self.driver.execute_async_script(
+            WAIT_FOR_NODES_SCRIPT,
+            node_selector,
+            baseline,
+            int(self.timeout * 1000),
+            scroll,
+        )
+
+        if count > baseline:
+            latency = time.monotonic() - start
+            if self.average_latency is None:
+                self.average_latency = latency
+            else:
+                self.average_latency += self.smoothing * (
+                    latency - self.average_latency
+                )
+        return count
@@ -0,0 +1,88 @@
+"""Conversion of Places API messages to Place and Review records.
+
+Fields are read from the raw protobuf messages behind the proto-plus
+wrappers, which skips the wrappers' per-attribute marshalling.
+"""
+
+from typing import List
+
+from google.maps import places_v1
+
+from ..models.place import Place, Review
+
+PLACE_URL = "https://www.google.com/maps/place/?q=place_id:{}"
+
+
+def place_from_pb(place) -> Place:
+    """Build a Place from a raw ``google.maps.places.v1.Place`` protobuf.
+
+    Args:
+        place: Raw Place protobuf message
+
+    Returns:
+        Place without reviews
+    """
+    has_location = place.HasField("location")
+    return Place(
+        name=place.display_name.text,
+        address=place.formatted_address,
+        phone=place.national_phone_number,
+        website=place.website_uri,
+        rating=place.rating,
+        total_reviews=place.user_rating_count,
+        url=PLACE_URL.format(place.id),
+        place_id=place.id,
+        latitude=place.location.latitude if has_location else None,
+        longitude=place.location.longitude if has_location else None,
+        types=list(place.types),
+        primary_type=place.primary_type,
+    )
+
+
+def review_from_pb(review) -> Review:
+    """Build a Review from a raw ``google.maps.places.v1.Review`` protobuf.
+
+    Args:
+        review: Raw Review protobuf message
+
+    Returns:
+        Review with its text in the requested language
+    """
+    return Review(
+        author=review.author_attribution.display_name,
+        text=review.text.text,
+        rating=int(review.rating),
+        time=review.relative_publish_time_description,
+        review_id=review.name,
+        language_code=review.text.language_code,
+        publish_time=(
+            review.publish_time.ToJsonString() if review.HasField("publish_time") else ""
+        ),
+    )
+
+
+def places_from_response(response: places_v1.SearchTextResponse) -> List[Place]:
+    """Convert the places of a searchText response.
+
+    Args:
+        response: searchText response
+
+    Returns:
+        Places in response order
+    """
+    return [
+        place_from_pb(place)
+        for place in places_v1.SearchTextResponse.pb(response).places
+    ]
+
+
+def reviews_from_place(place: places_v1.Place) -> List[Review]:
+    """Convert the reviews of a getPlace response.
+
+    Args:
+        place: getPlace response
+
+    Returns:
+        Reviews in response order
+    """
+    return [review_from_pb(review) for review in places_v1.Place.pb(place).reviews]
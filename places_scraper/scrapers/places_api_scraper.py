@@ -1,94 +1,214 @@
 """Places API scraper implementation."""
 
 import time
-from typing import Dict, Any, Tuple, List
-import json
-from google.protobuf.json_format import MessageToDict
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, Any, List, Tuple, Optional
+from ..models.place import Place
 from ..models.query import PlaceSearchQuery
+from ..utils.checkpoint import RunManifest
+from ..utils.metrics import metrics, record_place
+from ..utils.place_store import PlaceStore, place_store_from_config
+from ..utils.registry import PlaceRegistry
+from ..utils.sinks import BackgroundSink
 from .google_places_api import GooglePlacesAPI
 
+logger = logging.getLogger(__name__)
+
+
+async def _process_place(
+    api: GooglePlacesAPI,
+    config: Dict[str, Any],
+    place: Place,
+    semaphore: asyncio.Semaphore,
+    store: Optional[PlaceStore] = None,
+) -> Tuple[Optional[Place], float]:
+    """Fetch the reviews of a single place.
+
+    Args:
+        api: Shared Places API client
+        config: Configuration dictionary
+        place: Place returned by the search
+        semaphore: Limits the number of in-flight API calls
+        store: Place store of a refresh run; unchanged places keep their
+            stored reviews
+
+    Returns:
+        The place with its reviews, or None if it could not be processed,
+        and the time spent on it
+    """
+    place_start = time.time()
+    try:
+        max_reviews = config.get("maxReviews", 100)
+        reviews = (
+            store.unchanged_reviews(place, limit=max_reviews)
+            if store is not None
+            else None
+        )
+        if reviews is not None:
+            place.reviews = reviews
+        elif place.total_reviews > 0:
+            # Get reviews if place has any
+            async with semaphore:
+                place.reviews = await api.get_reviews(
+                    place.place_id, max_reviews=max_reviews
+                )
+        if reviews is None and store is not None:
+            store.put(place)
 
-async def run_places_api_scraper(
-    config: Dict[str, Any], output_file
-) -> Tuple[float, List[float]]:
-    """Run scraper using Places API."""
-    api = GooglePlacesAPI()
-    start_time = time.time()
-    place_times = []
-    default_location = "10.738727, 106.711703"  # Nguyễn Thị Thập, District 7, Ho Chi Minh City, Vietnam
-    is_first_result = True
-
-    for category in config["categories"]:
-        category_start = time.time()
-        print(f"\nProcessing category: {category}")
-
-        # Create search query
-        query = PlaceSearchQuery(
-            textQuery=category + ", " + config["textQuery"],
-            maxPlaces=config["maxPlaces"],
-            location=config.get("location", default_location),
-            radius=config["radiusKm"] * 1000,  # Convert km to meters
-            polygon=config.get("polygon", None),
-            languageCode=config.get("languageCode", "en"),
+        place_time = time.time() - place_start
+        logger.debug(
+            "Processed %s (%s) with %d reviews in %.2f seconds",
+            place.name or "Unknown", place.place_id, len(place.reviews), place_time,
         )
+        return place, place_time
 
-        # Search for places
-        search_start = time.time()
-        response = await api.search_places(query)
-        search_time = time.time() - search_start
-        print(f"Search completed in {search_time:.2f} seconds")
-
-        places = response.get("places", [])
-        print(f"Found {len(places)} places")
-
-        # Process places and add reviews
-        for i, place_data in enumerate(places, 1):
-            place_start = time.time()
-            try:
-                print(
-                    f"\nProcessing place {i}/{len(places)}: {place_data.get('displayName', {}).get('text', 'Unknown')}"
+    except Exception as e:
+        logger.warning(
+            "Error processing place %s: %s", place.place_id, e,
+            exc_info=logger.isEnabledFor(logging.DEBUG),
+        )
+        metrics.inc("place_errors_total")
+        return None, time.time() - place_start
+
+
+async def _iter_category(
+    api: GooglePlacesAPI,
+    config: Dict[str, Any],
+    category: str,
+    semaphore: asyncio.Semaphore,
+) -> AsyncIterator[Place]:
+    """Search the places of a category, yielding them as pages arrive.
+
+    Args:
+        api: Shared Places API client
+        config: Configuration dictionary
+        category: Category to search for
+        semaphore: Limits the number of in-flight API calls
+
+    Yields:
+        Places found, in search order
+    """
+    default_location = "10.738727, 106.711703"  # Nguyễn Thị Thập, District 7, Ho Chi Minh City, Vietnam
+    logger.info("Searching for %s", category)
+
+    # Create search query
+    query = PlaceSearchQuery(
+        textQuery=category + ", " + config["textQuery"],
+        maxPlaces=config["maxPlaces"],
+        location=config.get("location", default_location),
+        radius=config["radiusKm"] * 1000,  # Convert km to meters
+        polygon=config.get("polygon", None),
+        languageCode=config.get("languageCode", "en"),
+    )
+
+    # Search for places, tiling the area when maxPlaces exceeds one page
+    found = 0
+    with metrics.timer("search_seconds", category=category):
+        async for place in api.iter_places(query, semaphore):
+            found += 1
+            yield place
+    metrics.inc("places_found_total", found, category=category)
+    logger.info("Found %d places for %s", found, category)
+
+
+async def run_places_api_scraper(
+    config: Dict[str, Any],
+    sink: BackgroundSink,
+    manifest: RunManifest,
+    api: Optional[GooglePlacesAPI] = None,
+) -> Dict[str, int]:
+    """Run scraper using Places API.
+
+    Categories are searched concurrently, and reviews are fetched once per
+    distinct place as soon as a search page yields it, with at most
+    ``maxConcurrency`` search and review calls in flight at once. Places are
+    written once all searches are done, in category order and then search
+    order, so the output does not depend on which search answered first.
+    Places matching several categories are written once, with all of their
+    categories. In refresh mode, reviews are only fetched for places whose
+    rating or review count changed since they were last stored.
+
+    Args:
+        config: Configuration dictionary
+        sink: Output sink to stream places into
+        manifest: Checkpoint manifest; categories and places it lists are skipped
+        api: Optional Places API client, built from the config by default
+
+    Returns:
+        Run counters for the summary
+    """
+    api = api or GooglePlacesAPI(config)
+    # Places API searches return the 5 most relevant reviews, so they are
+    # either fetched again or kept, never synced incrementally
+    store = place_store_from_config(config) if config.get("refresh", False) else None
+    registry = PlaceRegistry()
+    # Time each category's search started
+    category_starts: Dict[str, float] = {}
+    semaphore = asyncio.Semaphore(config.get("maxConcurrency", 1))
+
+    categories = [
+        category
+        for category in config["categories"]
+        if not manifest.is_category_done(category)
+    ]
+    tasks: Dict[str, asyncio.Task] = {}
+    # Places found by each category, in search order
+    found: Dict[str, List[Place]] = {}
+
+    def finish_categories() -> None:
+        for category in registry.drain_finished():
+            sink.end_category(category)
+            category_time = time.time() - category_starts[category]
+            logger.info("Category %s completed in %.2f seconds", category, category_time)
+
+    async def search(category: str) -> None:
+        category_starts[category] = time.time()
+        places = found[category] = []
+        async for place in _iter_category(api, config, category, semaphore):
+            places.append(place)
+            key = place.place_id
+            # Start fetching reviews while the searches go on
+            if key not in tasks and not manifest.is_place_done(key):
+                tasks[key] = asyncio.create_task(
+                    _process_place(api, config, place, semaphore, store)
                 )
 
-                # Add category to place data
-                place_data["category"] = category
-
-                # Get reviews if place has any
-                if place_data.get("userRatingCount", 0) > 0:
-                    print(
-                        f"Getting reviews for place ID: {place_data.get('id', 'Unknown')}"
-                    )
-                    reviews_start = time.time()
-                    reviews_data = await api.get_reviews(
-                        place_data["id"], max_reviews=config.get("maxReviews", 100)
-                    )
-                    reviews_time = time.time() - reviews_start
-                    print(
-                        f"Fetched {len(reviews_data)} reviews in {reviews_time:.2f} seconds"
-                    )
-
-                    # Add reviews to place data
-                    place_data["reviews"] = reviews_data
-
-                # Convert any protobuf objects to dict before JSON serialization
-                serializable_data = json.loads(json.dumps(place_data, default=str))
-
-                # Write to file
-                if not is_first_result:
-                    output_file.write(",\n")
-                json.dump(serializable_data, output_file, ensure_ascii=False, indent=4)
-                is_first_result = False
-
-                place_time = time.time() - place_start
-                print(f"Place processed in {place_time:.2f} seconds")
-
-            except Exception as e:
-                print(f"Error processing place: {str(e)}")
-                print(f"Problematic place data: {place_data}")
-                continue
-
-        category_time = time.time() - category_start
-        place_times.append(category_time)
-        print(f"\nCategory {category} completed in {category_time:.2f} seconds")
-        print(f"Average time per place: {category_time/len(places):.2f} seconds")
-
-    return start_time, place_times
+    try:
+        await asyncio.gather(*(search(category) for category in categories))
+        # Register the results in category order, as searches finish in any order
+        for category in categories:
+            registry.register(
+                category, ((place.place_id, place) for place in found[category])
+            )
+
+        pending = []
+        for key, _ in registry:
+            if key in tasks:
+                pending.append(key)
+            else:
+                registry.mark_written(key)
+        finish_categories()
+
+        # Write to file in registration order
+        for key in pending:
+            place, place_time = await tasks[key]
+            if place is not None:
+                place.categories = registry.categories(key)
+                place.category = place.categories[0]
+                sink.write(place, key)
+                record_place(place.category, place_time, len(place.reviews))
+            registry.mark_written(key)
+            finish_categories()
+
+        logger.info("Review fetches saved by deduplication: %d", registry.fetches_saved)
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        stats = {**api.stats(), "review_fetches_saved": registry.fetches_saved}
+        api.close()
+        if store is not None:
+            stats.update(store.stats())
+            store.close()
+
+    return stats
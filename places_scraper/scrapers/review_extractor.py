@@ -0,0 +1,132 @@
+"""Batched review extraction shared by the Selenium-based scrapers."""
+
+import json
+from typing import List, Optional, Set
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from ..models.place import Review
+from ..utils.place_store import review_key
+
+# Sort menu of the reviews panel, and its "Newest" option
+SORT_BUTTON = "button[aria-label*='Sort reviews'], button[data-value='Sort']"
+NEWEST_OPTION = "div[role='menuitemradio'][data-index='1']"
+
+# Seconds to wait for the sort menu before scraping in the default order
+SORT_WAIT_SECONDS = 5
+
+# Returns every review node from the cursor onwards in one round trip, along
+# with the new cursor.
+EXTRACT_REVIEWS_SCRIPT = """
+const cursor = arguments[0];
+const nodes = document.querySelectorAll("div.jftiEf");
+const text = (node, selector) => {
+    const element = node.querySelector(selector);
+    return element ? element.innerText.trim() : "";
+};
+const reviews = [];
+for (let i = cursor; i < nodes.length; i++) {
+    const node = nodes[i];
+    const rating = node.querySelector("span.kvMYJc");
+    reviews.push({
+        id: node.getAttribute("data-review-id") || "",
+        author: text(node, "div.d4r55"),
+        date: text(node, "span.rsqaWe"),
+        text: text(node, "span.wiI7pd"),
+        rating: rating ? rating.getAttribute("aria-label") || "" : "",
+    });
+}
+return JSON.stringify({cursor: nodes.length, reviews: reviews});
+"""
+
+
+class ReviewExtractor:
+    """Collects reviews from an open reviews panel, a batch per call.
+
+    Each call reads only the review nodes past the cursor left by the previous
+    call, and reviews are deduplicated on their stable review id.
+
+    Given the review index of a place, only reviews missing from it are
+    returned. Once the panel is sorted newest first, the first indexed review
+    means every older one is indexed too, and extraction stops there.
+    """
+
+    def __init__(self, driver, known: Optional[Set[str]] = None):
+        """Initialize the extractor.
+
+        Args:
+            driver: WebDriver showing a place's reviews panel
+            known: Keys of the reviews already stored for the place
+        """
+        self.driver = driver
+        self.cursor = 0
+        self.seen: Set[str] = set()
+        self.known = known or set()
+        self.sorted_newest = False
+        self.caught_up = False
+
+    def sort_newest(self) -> bool:
+        """Sort the reviews panel newest first.
+
+        Returns:
+            True if the panel was re-sorted; on failure reviews stay in the
+            default order and known reviews are skipped without stopping
+        """
+        wait = WebDriverWait(self.driver, SORT_WAIT_SECONDS)
+        try:
+            loaded = self.driver.find_elements(By.CSS_SELECTOR, "div.jftiEf")
+            wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, SORT_BUTTON))).click()
+            wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, NEWEST_OPTION))).click()
+            # The panel reloads its reviews in the new order
+            if loaded:
+                wait.until(EC.staleness_of(loaded[0]))
+        except (TimeoutException, WebDriverException):
+            return False
+        self.cursor = 0
+        self.sorted_newest = True
+        return True
+
+    def extract_new(self, limit: int) -> List[Review]:
+        """Extract reviews loaded since the previous call.
+
+        Args:
+            limit: Maximum number of reviews to return
+
+        Returns:
+            List of reviews not returned before
+        """
+        batch = json.loads(
+            self.driver.execute_script(EXTRACT_REVIEWS_SCRIPT, self.cursor)
+        )
+        self.cursor = batch["cursor"]
+
+        reviews: List[Review] = []
+        for item in batch["reviews"]:
+            if len(reviews) >= limit:
+                break
+
+            # Extract just the number from the rating (e.g., "5 stars" -> "5")
+            rating = item["rating"].split()[0] if item["rating"] else "0"
+            review = Review(
+                author=item["author"],
+                text=item["text"],
+                rating=int(rating) if rating.isdigit() else 0,
+                time=item["date"],
+                review_id=item["id"],
+            )
+
+            # Fall back to the content for reviews without an id
+            key = review_key(review)
+            if key in self.known:
+                if self.sorted_newest:
+                    self.caught_up = True
+                    break
+                continue
+            if key in self.seen:
+                continue
+            self.seen.add(key)
+            reviews.append(review)
+        return reviews
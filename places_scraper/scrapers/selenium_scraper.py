@@ -1,61 +1,139 @@
 """Selenium scraper implementation."""
 
+import logging
 import time
-from typing import Dict, Any, Tuple, List
-import json
+from typing import Dict, Any, Optional
 
-from .google_maps_scraper import GoogleMapsScraper
+from .driver_pool import driver_pool_from_config
+from .google_maps_scraper import MAPS_URL, GoogleMapsScraper
 from ..models.place import Place, Review
-from ..utils.debug import debug
+from ..utils.checkpoint import RunManifest
+from ..utils.registry import PlaceRegistry, canonical_maps_url
+from ..utils.sinks import BackgroundSink
+from ..utils.metrics import metrics, record_place
+from ..utils.place_store import place_store_from_config
 
+logger = logging.getLogger(__name__)
 
-def run_selenium_scraper(
-    config: Dict[str, Any], output_file
-) -> Tuple[float, List[float]]:
-    """Run scraper using Selenium."""
-    # Initialize Selenium scraper
-    scraper = GoogleMapsScraper()
-    start_time = time.time()
-    place_times = []
-    is_first_result = True
+
+async def run_selenium_scraper(
+    config: Dict[str, Any], sink: BackgroundSink, manifest: RunManifest
+) -> Dict[str, int]:
+    """Run scraper using Selenium.
+
+    Every category is searched first, then reviews are scraped once per
+    distinct place, in parallel by a pool of ``driverPoolSize`` browsers.
+    With incremental review sync, only reviews newer than the stored ones are
+    scraped.
+
+    Args:
+        config: Configuration dictionary
+        sink: Output sink to stream places into
+        manifest: Checkpoint manifest; categories and places it lists are skipped
+
+    Returns:
+        Run counters for the summary
+    """
+    # Initialize Selenium scrapers
+    pool = driver_pool_from_config(
+        config,
+        lambda user_data_dir: GoogleMapsScraper(
+            profile=config.get("browserProfile", "default"),
+            maps_url=config.get("mapsUrl", MAPS_URL),
+            user_data_dir=user_data_dir,
+        ),
+    )
+    # Search results carry no Places id, so stored places are keyed by their
+    # canonical Maps URL, apart from the Places id keys of api and hybrid mode.
+    # Refresh mode is for api and hybrid runs, so only incremental sync uses it.
+    store = (
+        place_store_from_config(config)
+        if config.get("reviewSync") == "incremental"
+        else None
+    )
+    registry = PlaceRegistry()
+    # Time each category's search started
+    category_starts: Dict[str, float] = {}
+
+    def scrape_place(scraper: GoogleMapsScraper, place: Place) -> Optional[float]:
+        place_start = time.time()
+        key = canonical_maps_url(place.url)
+        known = store.review_keys(key) if store is not None else None
+        try:
+            # Get reviews for the place
+            place.reviews = scraper.get_reviews(place, config["maxReviews"], known)
+            if store is not None:
+                if known:
+                    # Follow the new reviews with the newest stored ones
+                    place.reviews += store.reviews(
+                        key, config["maxReviews"] - len(place.reviews)
+                    )
+                store.put(place, key)
+        except Exception as e:
+            logger.warning(
+                "Error scraping the reviews of %s: %s", place.url, e,
+                exc_info=logger.isEnabledFor(logging.DEBUG),
+            )
+            metrics.inc("place_errors_total")
+            return None
+
+        place_time = time.time() - place_start
+        logger.debug(
+            "Processed %d reviews for %s in %.2f seconds",
+            len(place.reviews), place.name, place_time,
+        )
+        return place_time
 
     try:
         for category in config["categories"]:
-            print(f"\nSearching for {category}...")
-            category_start = time.time()
+            if manifest.is_category_done(category):
+                continue
+            logger.info("Searching for %s", category)
+            category_starts[category] = time.time()
 
             # Get places for the category
-            places = scraper.get_places(config, category)
-
-            # Process each place
-            for place in places:
-                place_start = time.time()
-                try:
-                    # Get reviews for the place
-                    reviews = scraper.get_reviews(place, config["maxReviews"])
-                    place.reviews = reviews
-
-                    # Write to file
-                    if not is_first_result:
-                        output_file.write(",\n")
-                    json.dump(
-                        place.to_dict(), output_file, ensure_ascii=False, indent=4
-                    )
-                    is_first_result = False
+            with metrics.timer("search_seconds", category=category):
+                with pool.acquire() as scraper:
+                    places = scraper.get_places(config, category)
+            metrics.inc("places_found_total", len(places), category=category)
+            registry.register(
+                category, ((canonical_maps_url(place.url), place) for place in places)
+            )
 
-                    place_time = time.time() - place_start
-                    place_times.append(place_time)
-                    print(f"Place processed in {place_time:.2f} seconds")
+        pending = []
+        for key, place in registry:
+            if manifest.is_place_done(key):
+                registry.mark_written(key)
+            else:
+                pending.append((key, place))
 
-                except Exception as e:
-                    debug("run_selenium_scraper", e)
-                    continue
+        # Process places across the pool, writing them in first-seen order
+        places = [place for _, place in pending]
+        for (key, place), place_time in zip(pending, pool.map(scrape_place, places)):
+            if place_time is not None:
+                # Write to file
+                place.categories = registry.categories(key)
+                place.category = place.categories[0]
+                sink.write(place, key)
+                record_place(place.category, place_time, len(place.reviews))
+            registry.mark_written(key)
 
-            category_time = time.time() - category_start
-            print(f"Category completed in {category_time:.2f} seconds")
+            for category in registry.drain_finished():
+                sink.end_category(category)
+                category_time = time.time() - category_starts[category]
+                logger.info(
+                    "Category %s completed in %.2f seconds", category, category_time
+                )
 
-    except Exception as e:
-        print(f"Error in Selenium scraper: {str(e)}")
+        for category in registry.drain_finished():
+            sink.end_category(category)
+
+        logger.info("Review fetches saved by deduplication: %d", registry.fetches_saved)
     finally:
-        scraper.close()
-        return start_time, place_times
+        pool.close()
+        stats = {"review_fetches_saved": registry.fetches_saved}
+        if store is not None:
+            stats.update(store.stats())
+            store.close()
+
+    return stats
@@ -0,0 +1,204 @@
+"""Persistent response cache for Places API calls."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+CACHE_MODES = ("off", "read", "readwrite")
+
+# Default time-to-live per endpoint, in seconds
+DEFAULT_CACHE_TTLS = {
+    "searchText": 24 * 60 * 60,
+    "getPlace": 24 * 60 * 60,
+}
+
+DEFAULT_CACHE_MAX_MB = 256
+
+# Version of the cached value layout; bumping it retires older entries
+CACHE_FORMAT = 2
+
+
+class ResponseCache:
+    """SQLite-backed, content-addressed cache of API responses.
+
+    Entries are keyed by a hash of the endpoint, request parameters and field
+    mask, expire after a per-endpoint TTL, and are evicted least recently used
+    first once the stored payloads exceed ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "readwrite",
+        ttls: Optional[Dict[str, float]] = None,
+        max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Open or create the cache database.
+
+        Args:
+            path: Path of the SQLite database file
+            mode: "read" to only serve hits, "readwrite" to also store misses
+            ttls: Mapping of endpoint name to time-to-live in seconds, merged
+                over DEFAULT_CACHE_TTLS
+            max_bytes: Maximum total size of cached payloads
+            clock: Wall clock returning seconds, injectable for testing
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Invalid cache mode. Must be {', '.join(CACHE_MODES)}")
+
+        self.path = path
+        self.mode = mode
+        self.ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Worker processes share the database, so wait out each other's writes
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict[str, Any], field_mask: List[str]) -> str:
+        """Build the content address of a request.
+
+        Args:
+            endpoint: Endpoint name, e.g. "searchText" or "getPlace"
+            params: Request parameters
+            field_mask: Requested response fields
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps(
+            {
+                "endpoint": endpoint,
+                "params": params,
+                "fieldMask": sorted(field_mask),
+                "format": CACHE_FORMAT,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, endpoint: str, key: str) -> Optional[Any]:
+        """Look up a cached response.
+
+        Args:
+            endpoint: Endpoint name, used to pick the TTL
+            key: Key from make_key
+
+        Returns:
+            The cached response, or None on a miss or expired entry
+        """
+        now = self._clock()
+        row = self._conn.execute(
+            "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None or now - row[1] > self.ttls.get(endpoint, 0):
+            if row is not None and self.mode == "readwrite":
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+            self.misses += 1
+            return None
+
+        if self.mode == "readwrite":
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, endpoint: str, key: str, value: Any) -> None:
+        """Store a response, evicting least recently used entries if needed.
+
+        Args:
+            endpoint: Endpoint name
+            key: Key from make_key
+            value: JSON-serializable response
+        """
+        if self.mode != "readwrite":
+            return
+
+        now = self._clock()
+        payload = json.dumps(value, ensure_ascii=False, default=str)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+            (key, endpoint, payload, len(payload.encode("utf-8")), now, now),
+        )
+        self._evict()
+        self._conn.commit()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under the size bound."""
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counters."""
+        return {"cache_hits": self.hits, "cache_misses": self.misses}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+def cache_from_config(config: Dict[str, Any]) -> Optional[ResponseCache]:
+    """Build the response cache described by the configuration.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        ResponseCache under ``output_dir``, or None if ``cache`` is "off"
+    """
+    mode = config.get("cache", "off")
+    if mode == "off":
+        return None
+
+    output_dir = config.get("output_dir", "output")
+    return ResponseCache(
+        os.path.join(output_dir, "cache.sqlite3"),
+        mode=mode,
+        ttls=config.get("cacheTtl"),
+        max_bytes=int(config.get("cacheMaxMb", DEFAULT_CACHE_MAX_MB) * 1024 * 1024),
+    )
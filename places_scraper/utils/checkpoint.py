@@ -0,0 +1,194 @@
+"""Checkpoint manifest for resumable runs."""
+
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+MANIFEST_SUFFIX = ".manifest.json"
+
+PLACES_LOG_SUFFIX = ".places.log"
+
+
+def manifest_path_for(output_path: str) -> str:
+    """Return the manifest path that sits next to an output file.
+
+    Args:
+        output_path: Path of the run's output file, e.g. places_<timestamp>.json
+            or places_<timestamp>.ndjson.gz
+
+    Returns:
+        Path of the matching places_<timestamp>.manifest.json
+    """
+    directory, name = os.path.split(output_path)
+    return os.path.join(directory, f"{name.split('.', 1)[0]}{MANIFEST_SUFFIX}")
+
+
+class RunManifest:
+    """Records which categories and places a run has finished.
+
+    The keys of written places are appended to a places log next to the
+    manifest, one per line. After every flushed batch of places, the small
+    manifest is rewritten atomically with the byte offsets of the output
+    file and of the places log after that batch, so a killed run can be
+    truncated back to its last complete place and resumed. Log lines past
+    the recorded offset were never committed and are overwritten.
+    """
+
+    def __init__(self, path: str, data: Dict[str, Any]):
+        """Initialize the manifest, reading the committed part of its places log.
+
+        Args:
+            path: Path of the manifest file
+            data: Manifest contents
+        """
+        self.path = path
+        self.data = data
+        base = path[: -len(MANIFEST_SUFFIX)] if path.endswith(MANIFEST_SUFFIX) else path
+        self.places_path = f"{base}{PLACES_LOG_SUFFIX}"
+        self._completed_places: Set[str] = set()
+
+        offset = data.setdefault("places_log_offset", 0)
+        if offset:
+            with open(self.places_path, "rb") as places_file:
+                committed = places_file.read(offset).decode("utf-8")
+            self._completed_places.update(committed.splitlines())
+        # Manifests of earlier versions listed the places inline
+        self._unlogged: List[str] = data.pop("completed_places", [])
+        self._completed_places.update(self._unlogged)
+
+    @classmethod
+    def create(
+        cls,
+        output_path: str,
+        scraper: str,
+        output_format: str = "json",
+        output_offset: int = 0,
+    ) -> "RunManifest":
+        """Start a manifest for a new run.
+
+        Args:
+            output_path: Path of the run's output file
+            scraper: Scraper type used for the run
+            output_format: Output sink format of the run
+            output_offset: Output size once the file header is written
+
+        Returns:
+            The saved manifest
+        """
+        manifest = cls(
+            manifest_path_for(output_path),
+            {
+                "output_file": os.path.basename(output_path),
+                "output_format": output_format,
+                "scraper": scraper,
+                "status": "running",
+                "output_offset": output_offset,
+                "places_log_offset": 0,
+                "completed_categories": [],
+            },
+        )
+        manifest.save()
+        return manifest
+
+    @classmethod
+    def load(cls, path: str) -> "RunManifest":
+        """Load the manifest of an earlier run.
+
+        Args:
+            path: Path of the manifest file
+
+        Returns:
+            The loaded manifest
+        """
+        with open(path, "r", encoding="utf-8") as manifest_file:
+            return cls(path, json.load(manifest_file))
+
+    @classmethod
+    def find(cls, run: str, output_dir: str) -> Optional["RunManifest"]:
+        """Locate a run's manifest from a timestamp, output path or manifest path.
+
+        Args:
+            run: Run timestamp (e.g. 20240315_123456) or path to its files
+            output_dir: Directory holding run outputs
+
+        Returns:
+            The loaded manifest, or None if it does not exist
+        """
+        candidates = [
+            run if run.endswith(MANIFEST_SUFFIX) else manifest_path_for(run),
+            os.path.join(output_dir, f"places_{run}{MANIFEST_SUFFIX}"),
+        ]
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                return cls.load(candidate)
+        return None
+
+    @property
+    def output_path(self) -> str:
+        """Path of the run's output file."""
+        return os.path.join(os.path.dirname(self.path), self.data["output_file"])
+
+    @property
+    def place_count(self) -> int:
+        """Number of places already written."""
+        return len(self._completed_places)
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether the run finished."""
+        return self.data["status"] == "complete"
+
+    def is_category_done(self, category: str) -> bool:
+        """Check whether every place of a category was written."""
+        return category in self.data["completed_categories"]
+
+    def is_place_done(self, key: str) -> bool:
+        """Check whether a place was written.
+
+        Args:
+            key: Places id or Maps URL identifying the place
+        """
+        return key in self._completed_places
+
+    def record(
+        self, keys: Iterable[str], categories: Iterable[str], output_offset: int
+    ) -> None:
+        """Record a batch of written places and finished categories.
+
+        Args:
+            keys: Places ids or Maps URLs identifying the written places
+            categories: Categories whose places were all written
+            output_offset: Output size after the batch was flushed
+        """
+        keys = self._unlogged + [key for key in keys if key not in self._completed_places]
+        if keys:
+            offset = self.data["places_log_offset"]
+            lines = "".join(f"{key}\n" for key in keys).encode("utf-8")
+            with open(
+                self.places_path, "r+b" if offset else "wb"
+            ) as places_file:
+                # Overwrite whatever a killed run appended past the last commit
+                places_file.seek(offset)
+                places_file.write(lines)
+                places_file.truncate()
+            self.data["places_log_offset"] = offset + len(lines)
+            self._completed_places.update(keys)
+            self._unlogged = []
+        for category in categories:
+            if category not in self.data["completed_categories"]:
+                self.data["completed_categories"].append(category)
+        self.data["output_offset"] = output_offset
+        self.save()
+
+    def mark_complete(self) -> None:
+        """Record that the run finished and its output is terminated."""
+        self.data["status"] = "complete"
+        self.save()
+
+    def save(self) -> None:
+        """Atomically write the manifest to disk."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(self.data, manifest_file, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
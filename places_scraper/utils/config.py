@@ -34,4 +34,86 @@ def validate_config(config: Dict[str, Any]) -> None:
         raise ValueError("maxPlaces must be a positive integer")
         
     if not isinstance(config['radiusKm'], (int, float)) or config['radiusKm'] <= 0:
-        raise ValueError("radiusKm must be a positive number") 
\ No newline at end of file
+        raise ValueError("radiusKm must be a positive number")
+
+    if 'maxConcurrency' in config and (
+            not isinstance(config['maxConcurrency'], int) or config['maxConcurrency'] <= 0):
+        raise ValueError("maxConcurrency must be a positive integer")
+
+    if 'driverPoolSize' in config and (
+            not isinstance(config['driverPoolSize'], int) or config['driverPoolSize'] <= 0):
+        raise ValueError("driverPoolSize must be a positive integer")
+
+    if 'pipelineQueueSize' in config and (
+            not isinstance(config['pipelineQueueSize'], int) or config['pipelineQueueSize'] <= 0):
+        raise ValueError("pipelineQueueSize must be a positive integer")
+
+    if 'driverMaxPages' in config and (
+            not isinstance(config['driverMaxPages'], int) or config['driverMaxPages'] <= 0):
+        raise ValueError("driverMaxPages must be a positive integer")
+
+    for key in ('driverMaxRssMb', 'placeTimeoutSeconds'):
+        if key in config and (
+                not isinstance(config[key], (int, float)) or config[key] <= 0):
+            raise ValueError(f"{key} must be a positive number")
+
+    for endpoint, limit in config.get('rateLimits', {}).items():
+        if not isinstance(limit, dict) or not isinstance(limit.get('qps'), (int, float)) \
+                or limit['qps'] <= 0:
+            raise ValueError(f"rateLimits.{endpoint}.qps must be a positive number")
+
+    if 'maxTileDepth' in config and (
+            not isinstance(config['maxTileDepth'], int) or config['maxTileDepth'] < 0):
+        raise ValueError("maxTileDepth must be a non-negative integer")
+
+    if config.get('cache', 'off') not in ('off', 'read', 'readwrite'):
+        raise ValueError("cache must be one of off, read, readwrite")
+
+    if config.get('outputFormat', 'json') not in ('json', 'ndjson', 'ndjson.gz'):
+        raise ValueError("outputFormat must be one of json, ndjson, ndjson.gz")
+
+    if 'outputIndent' in config and (
+            not isinstance(config['outputIndent'], int) or config['outputIndent'] < 0):
+        raise ValueError("outputIndent must be a non-negative integer")
+
+    if not isinstance(config.get('refresh', False), bool):
+        raise ValueError("refresh must be true or false")
+
+    if config.get('reviewSync', 'full') not in ('full', 'incremental'):
+        raise ValueError("reviewSync must be one of full, incremental")
+
+    if 'placeStore' in config and not isinstance(config['placeStore'], str):
+        raise ValueError("placeStore must be a file path")
+
+    if 'areas' in config and (
+            not isinstance(config['areas'], list)
+            or not all(isinstance(area, dict) for area in config['areas'])):
+        raise ValueError("areas must be a list of objects")
+
+    if 'jobMaxAttempts' in config and (
+            not isinstance(config['jobMaxAttempts'], int) or config['jobMaxAttempts'] < 1):
+        raise ValueError("jobMaxAttempts must be a positive integer")
+
+    if 'jobLeaseSeconds' in config and (
+            not isinstance(config['jobLeaseSeconds'], (int, float))
+            or config['jobLeaseSeconds'] <= 0):
+        raise ValueError("jobLeaseSeconds must be a positive number")
+
+    if config.get('logLevel', 'INFO') not in ('DEBUG', 'INFO', 'WARNING', 'ERROR'):
+        raise ValueError("logLevel must be one of DEBUG, INFO, WARNING, ERROR")
+
+    if 'logFile' in config and not isinstance(config['logFile'], str):
+        raise ValueError("logFile must be a file path")
+
+    if not isinstance(config.get('profile', False), bool):
+        raise ValueError("profile must be true or false")
+
+    if 'profileTopN' in config and (
+            not isinstance(config['profileTopN'], int) or config['profileTopN'] < 1):
+        raise ValueError("profileTopN must be a positive integer")
+
+    if 'prometheusFile' in config and not isinstance(config['prometheusFile'], str):
+        raise ValueError("prometheusFile must be a file path")
+
+    if config.get('browserProfile', 'default') not in ('default', 'lean'):
+        raise ValueError("browserProfile must be one of default, lean")
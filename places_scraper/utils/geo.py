@@ -0,0 +1,183 @@
+"""Geometry helpers for tiling a search area."""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+# Length of one degree of latitude, in meters
+METERS_PER_DEGREE = 111_320.0
+
+Point = Tuple[float, float]
+
+
+def parse_location(location: Union[str, Sequence[float], Dict[str, float]]) -> Point:
+    """Parse a location into a (latitude, longitude) pair.
+
+    Args:
+        location: "lat, lng" string, {"latitude": ..., "longitude": ...} dict,
+            or GeoJSON-style [lng, lat] pair
+
+    Returns:
+        Tuple of latitude and longitude
+    """
+    if isinstance(location, str):
+        latitude, longitude = (float(part) for part in location.split(","))
+        return latitude, longitude
+    if isinstance(location, dict):
+        return float(location["latitude"]), float(location["longitude"])
+    return float(location[1]), float(location[0])
+
+
+@dataclass(frozen=True)
+class Tile:
+    """Latitude/longitude rectangle searched with a single request."""
+
+    south: float
+    west: float
+    north: float
+    east: float
+    depth: int = 0
+
+    @property
+    def center(self) -> Point:
+        """Center of the tile as (latitude, longitude)."""
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    def split(self) -> List["Tile"]:
+        """Split the tile into its four quadrants."""
+        latitude, longitude = self.center
+        depth = self.depth + 1
+        return [
+            Tile(self.south, self.west, latitude, longitude, depth),
+            Tile(self.south, longitude, latitude, self.east, depth),
+            Tile(latitude, self.west, self.north, longitude, depth),
+            Tile(latitude, longitude, self.north, self.east, depth),
+        ]
+
+    def contains(self, latitude: float, longitude: float) -> bool:
+        """Check whether a point lies inside the tile."""
+        return self.south <= latitude <= self.north and self.west <= longitude <= self.east
+
+    def to_rectangle(self) -> Dict[str, Dict[str, float]]:
+        """Return the tile as a Places API viewport."""
+        return {
+            "low": {"latitude": self.south, "longitude": self.west},
+            "high": {"latitude": self.north, "longitude": self.east},
+        }
+
+
+def _segments_intersect(p1: Point, p2: Point, q1: Point, q2: Point) -> bool:
+    def orientation(a: Point, b: Point, c: Point) -> float:
+        return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+    d1 = orientation(q1, q2, p1)
+    d2 = orientation(q1, q2, p2)
+    d3 = orientation(p1, p2, q1)
+    d4 = orientation(p1, p2, q2)
+    return d1 * d2 <= 0 and d3 * d4 <= 0
+
+
+class SearchArea:
+    """Circle or polygon that a tiled search must cover."""
+
+    def __init__(
+        self,
+        center: Point = (0.0, 0.0),
+        radius_m: float = 0.0,
+        polygon: Optional[List[Point]] = None,
+    ):
+        """Initialize the area; give either a center and radius or a polygon.
+
+        Args:
+            center: Circle center as (latitude, longitude)
+            radius_m: Circle radius in meters
+            polygon: Polygon ring as (latitude, longitude) points
+        """
+        self.center = center
+        self.radius_m = radius_m
+        self.polygon = polygon
+
+    @classmethod
+    def from_query(cls, query: Mapping[str, Any]) -> "SearchArea":
+        """Build the area of a search query.
+
+        Args:
+            query: Search query with a GeoJSON ``polygon``, or a ``location``
+                and ``radius`` in meters
+
+        Returns:
+            The polygon if one is given, the circle otherwise
+        """
+        polygon = query.get("polygon")
+        if polygon:
+            ring = polygon["coordinates"][0]
+            return cls(polygon=[(latitude, longitude) for longitude, latitude in ring])
+        return cls(center=parse_location(query["location"]), radius_m=query["radius"])
+
+    def _distance_m(self, a: Point, b: Point) -> float:
+        """Approximate distance in meters between two nearby points."""
+        mean_latitude = math.radians((a[0] + b[0]) / 2)
+        dy = (a[0] - b[0]) * METERS_PER_DEGREE
+        dx = (a[1] - b[1]) * METERS_PER_DEGREE * math.cos(mean_latitude)
+        return math.hypot(dx, dy)
+
+    def bounding_tile(self) -> Tile:
+        """Return the smallest tile enclosing the area."""
+        if self.polygon:
+            latitudes = [point[0] for point in self.polygon]
+            longitudes = [point[1] for point in self.polygon]
+            return Tile(min(latitudes), min(longitudes), max(latitudes), max(longitudes))
+
+        latitude, longitude = self.center
+        d_latitude = self.radius_m / METERS_PER_DEGREE
+        d_longitude = self.radius_m / (
+            METERS_PER_DEGREE * math.cos(math.radians(latitude))
+        )
+        return Tile(
+            latitude - d_latitude,
+            longitude - d_longitude,
+            latitude + d_latitude,
+            longitude + d_longitude,
+        )
+
+    def contains(self, latitude: float, longitude: float) -> bool:
+        """Check whether a point lies inside the area."""
+        if not self.polygon:
+            return self._distance_m(self.center, (latitude, longitude)) <= self.radius_m
+
+        # Ray casting along the longitude axis
+        inside = False
+        ring = self.polygon
+        for (lat1, lng1), (lat2, lng2) in zip(ring, ring[1:] + ring[:1]):
+            if (lat1 > latitude) != (lat2 > latitude):
+                crossing = lng1 + (latitude - lat1) * (lng2 - lng1) / (lat2 - lat1)
+                if longitude < crossing:
+                    inside = not inside
+        return inside
+
+    def intersects(self, tile: Tile) -> bool:
+        """Check whether any part of a tile lies inside the area."""
+        if not self.polygon:
+            # Closest point of the tile to the circle center
+            closest = (
+                min(max(self.center[0], tile.south), tile.north),
+                min(max(self.center[1], tile.west), tile.east),
+            )
+            return self._distance_m(self.center, closest) <= self.radius_m
+
+        corners = [
+            (tile.south, tile.west),
+            (tile.south, tile.east),
+            (tile.north, tile.east),
+            (tile.north, tile.west),
+        ]
+        if any(tile.contains(*point) for point in self.polygon):
+            return True
+        if any(self.contains(*corner) for corner in corners):
+            return True
+        ring = self.polygon
+        return any(
+            _segments_intersect(p1, p2, c1, c2)
+            for p1, p2 in zip(ring, ring[1:] + ring[:1])
+            for c1, c2 in zip(corners, corners[1:] + corners[:1])
+        )
@@ -0,0 +1,226 @@
+"""Durable queue of scraping jobs shared by worker processes."""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+JOB_STATES = ("pending", "leased", "done", "failed")
+
+# Seconds a leased job stays reserved for its worker without a renewal
+DEFAULT_LEASE_SECONDS = 600
+
+# Attempts per job before it is marked failed
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+@dataclass
+class Job:
+    """A category to scrape in one search area."""
+
+    id: int
+    area: Dict[str, Any]
+    category: str
+    attempts: int
+    worker: str
+
+
+class JobQueue:
+    """SQLite-backed queue of (area, category) jobs with leases and retries.
+
+    Workers lease one job at a time. A lease expires unless the worker renews
+    it, so the jobs of a crashed worker are retried by the others. A job that
+    fails, or whose lease expires, returns to the queue until it has been
+    attempted ``max_attempts`` times.
+
+    Any number of processes may share the database file, also from several
+    machines on shared storage whose file locking SQLite supports. It uses
+    the rollback journal rather than WAL for that reason.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Open or create the queue database.
+
+        Args:
+            path: Path of the SQLite database file
+            max_attempts: Attempts per job before it is marked failed
+            clock: Wall clock returning seconds, injectable for testing
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        self._clock = clock
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit; writes that read first take the write lock up front
+        self._conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                area TEXT NOT NULL,
+                category TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_expires REAL,
+                output TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                UNIQUE (area, category)
+            )
+            """
+        )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements atomically, holding the database write lock."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def add(self, areas: Iterable[Dict[str, Any]], categories: Iterable[str]) -> int:
+        """Queue every category in every area, skipping jobs already queued.
+
+        Args:
+            areas: Config overrides locating each area, e.g. ``textQuery``,
+                ``location``, ``radiusKm`` or ``polygon``
+            categories: Categories to scrape in each area
+
+        Returns:
+            Number of jobs added
+        """
+        categories = list(categories)
+        now = self._clock()
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (area, category, updated_at) VALUES (?, ?, ?)",
+                (
+                    (json.dumps(area, sort_keys=True), category, now)
+                    for area in areas
+                    for category in categories
+                ),
+            )
+            return conn.total_changes - before
+
+    def lease(
+        self, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ) -> Optional[Job]:
+        """Reserve the oldest job that is pending or whose lease expired.
+
+        Args:
+            worker: Identifier of the leasing worker
+            lease_seconds: Seconds until the lease expires unless renewed
+
+        Returns:
+            The leased job, or None if no job is available right now
+        """
+        now = self._clock()
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                UPDATE jobs SET state = 'failed', error = 'lease expired',
+                    worker = NULL, updated_at = ?
+                WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?
+                """,
+                (now, now, self.max_attempts),
+            )
+            row = conn.execute(
+                """
+                SELECT id, area, category, attempts FROM jobs
+                WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?)
+                ORDER BY id LIMIT 1
+                """,
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, area, category, attempts = row
+            conn.execute(
+                """
+                UPDATE jobs SET state = 'leased', attempts = ?, worker = ?,
+                    lease_expires = ?, updated_at = ?
+                WHERE id = ?
+                """,
+                (attempts + 1, worker, now + lease_seconds, now, job_id),
+            )
+        return Job(job_id, json.loads(area), category, attempts + 1, worker)
+
+    def renew(self, job: Job, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Extend a job's lease.
+
+        Args:
+            job: Job leased by this worker
+            lease_seconds: Seconds from now until the lease expires
+
+        Returns:
+            False if the lease was lost, e.g. because it had expired and
+            another worker took the job over
+        """
+        now = self._clock()
+        cursor = self._conn.execute(
+            """
+            UPDATE jobs SET lease_expires = ?, updated_at = ?
+            WHERE id = ? AND worker = ? AND state = 'leased'
+            """,
+            (now + lease_seconds, now, job.id, job.worker),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job: Job, output: str) -> None:
+        """Mark a job done.
+
+        Args:
+            job: Job leased by this worker
+            output: Path of the job's output shard
+        """
+        self._conn.execute(
+            """
+            UPDATE jobs SET state = 'done', output = ?, error = NULL, worker = NULL,
+                updated_at = ?
+            WHERE id = ? AND worker = ?
+            """,
+            (output, self._clock(), job.id, job.worker),
+        )
+
+    def fail(self, job: Job, error: str) -> None:
+        """Return a failed job to the queue, or mark it failed once out of attempts.
+
+        Args:
+            job: Job leased by this worker
+            error: Description of the failure
+        """
+        state = "failed" if job.attempts >= self.max_attempts else "pending"
+        self._conn.execute(
+            """
+            UPDATE jobs SET state = ?, error = ?, worker = NULL, updated_at = ?
+            WHERE id = ? AND worker = ?
+            """,
+            (state, error, self._clock(), job.id, job.worker),
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of jobs in each state."""
+        counts = dict.fromkeys(JOB_STATES, 0)
+        counts.update(
+            self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state")
+        )
+        return counts
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
@@ -0,0 +1,128 @@
+"""Logging setup for the scrapers.
+
+Modules log through ``logging.getLogger(__name__)`` with %-style arguments,
+so messages below the configured level are never formatted. Records are
+handed to a queue and formatted and written by a listener thread, keeping
+console and file I/O off the event loop and the browser pool threads.
+Repeated warnings and errors are rate-limited per message.
+"""
+
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Level used when the config does not set logLevel
+DEFAULT_LOG_LEVEL = "INFO"
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+# Times a warning or error may repeat per interval before it is suppressed
+REPEAT_BURST = 5
+REPEAT_INTERVAL = 60.0
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class RepeatFilter(logging.Filter):
+    """Rate-limit repeated warnings and errors.
+
+    Records are grouped by logger, level and unformatted message, so
+    ``logger.warning("Timed out on %s", url)`` counts as one message for every
+    URL. Each message is let through ``burst`` times per ``interval``; the
+    first one let through after that reports how many were suppressed.
+    """
+
+    def __init__(
+        self,
+        burst: int = REPEAT_BURST,
+        interval: float = REPEAT_INTERVAL,
+        level: int = logging.WARNING,
+    ):
+        """Initialize the filter.
+
+        Args:
+            burst: Records of a message let through per interval
+            interval: Length of the rate-limiting window, in seconds
+            level: Records below this level are never rate-limited
+        """
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.level = level
+        self._lock = threading.Lock()
+        # Message key -> [window start, records in window, suppressed records]
+        self._windows: Dict[Tuple[str, int, str], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.level:
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.setdefault(key, [now, 0, 0])
+            if now - window[0] >= self.interval:
+                window[0], window[1] = now, 0
+            if window[1] >= self.burst:
+                window[2] += 1
+                return False
+            window[1] += 1
+            suppressed, window[2] = window[2], 0
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue records unformatted, leaving all formatting to the listener.
+
+    Log arguments must not change after the call; pass strings and numbers
+    rather than objects that are still being filled in.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(level: str = DEFAULT_LOG_LEVEL, log_file: Optional[str] = None) -> None:
+    """Route the package's log records through a queue to the console.
+
+    Args:
+        level: Lowest level logged, one of LOG_LEVELS
+        log_file: Optional file to also append the log to
+    """
+    global _listener
+    shutdown_logging()
+
+    formatter = logging.Formatter(LOG_FORMAT, datefmt="%H:%M:%S")
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(RepeatFilter())
+
+    logger = logging.getLogger("places_scraper")
+    logger.handlers = [queue_handler]
+    logger.setLevel(level)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Write out the queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
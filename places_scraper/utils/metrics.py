@@ -0,0 +1,284 @@
+"""Run metrics: labelled counters, gauges and latency histograms.
+
+Scrapers record into the module-level ``metrics`` registry, which is safe to
+use from the event loop, browser pool threads and the output writer thread.
+At the end of a run it is exported as a JSON report and, optionally, in the
+Prometheus text format (e.g. for the node_exporter textfile collector).
+"""
+
+import bisect
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0
+)
+
+# Prefix of the exported Prometheus metric names
+PROMETHEUS_PREFIX = "places_scraper_"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def report_path_for(output_path: str) -> str:
+    """Return the run report path belonging to an output file.
+
+    Args:
+        output_path: Path of the run's output file
+
+    Returns:
+        Path of the JSON run report next to it
+    """
+    directory, filename = os.path.split(output_path)
+    return os.path.join(directory, f"{filename.split('.', 1)[0]}.report.json")
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Bucketed distribution of observed values."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add one observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def merge(self, other: "Histogram") -> None:
+        """Add the observations of a histogram with the same buckets."""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating within its bucket.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or 0 without observations
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                upper = min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Return the count, sum and main statistics."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe store of labelled metrics."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self.labels: Dict[str, str] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+
+    def reset(self, **labels: str) -> None:
+        """Drop every metric and set the labels shared by all of them.
+
+        Args:
+            labels: Run-wide labels, e.g. ``scraper="api"``
+        """
+        with self._lock:
+            self.labels = dict(labels)
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    @staticmethod
+    def _key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Increase a counter.
+
+        Args:
+            name: Counter name, ending in ``_total``
+            value: Amount to add
+            labels: Metric labels, e.g. ``category``
+        """
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge.
+
+        Args:
+            name: Gauge name
+            value: Current value
+            labels: Metric labels
+        """
+        with self._lock:
+            self._gauges.setdefault(name, {})[self._key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Add an observation to a histogram.
+
+        Args:
+            name: Histogram name, ending in the unit, e.g. ``_seconds``
+            value: Observed value
+            labels: Metric labels
+        """
+        key = self._key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Observe the duration of a block in a histogram, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def total(self, name: str) -> float:
+        """Return the sum of a counter over all of its labels."""
+        with self._lock:
+            return sum(self._counters.get(name, {}).values())
+
+    def histogram(self, name: str) -> Histogram:
+        """Return a histogram merged over all of its labels."""
+        merged = Histogram()
+        with self._lock:
+            for histogram in self._histograms.get(name, {}).values():
+                merged.merge(histogram)
+        return merged
+
+    def report(self) -> Dict[str, Any]:
+        """Return every metric as JSON-serializable data."""
+
+        def series(values: Dict[str, Dict[LabelKey, Any]], convert) -> List[Dict[str, Any]]:
+            return [
+                {"name": name, "labels": dict(key), **convert(value)}
+                for name in sorted(values)
+                for key, value in sorted(values[name].items())
+            ]
+
+        with self._lock:
+            return {
+                "labels": dict(self.labels),
+                "counters": series(self._counters, lambda value: {"value": value}),
+                "gauges": series(self._gauges, lambda value: {"value": value}),
+                "histograms": series(self._histograms, Histogram.summary),
+            }
+
+    def write_report(self, path: str, **extra: Any) -> None:
+        """Write the JSON run report.
+
+        Args:
+            path: Path of the report file
+            extra: Additional top-level fields, e.g. the run duration
+        """
+        with open(path, "w", encoding="utf-8") as report_file:
+            json.dump({**extra, **self.report()}, report_file, indent=4)
+
+    def prometheus_text(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+
+        def labels_text(key: LabelKey, **more: str) -> str:
+            pairs = {**self.labels, **dict(key), **more}
+            if not pairs:
+                return ""
+            escaped = (
+                f'{name}="{_escape(value)}"' for name, value in sorted(pairs.items())
+            )
+            return "{" + ",".join(escaped) + "}"
+
+        lines = []
+        with self._lock:
+            for kind, values in (("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted(values):
+                    metric = PROMETHEUS_PREFIX + name
+                    lines.append(f"# TYPE {metric} {kind}")
+                    for key, value in sorted(values[name].items()):
+                        lines.append(f"{metric}{labels_text(key)} {value}")
+
+            for name in sorted(self._histograms):
+                metric = PROMETHEUS_PREFIX + name
+                lines.append(f"# TYPE {metric} histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    bounds = [*histogram.buckets, math.inf]
+                    for bound, count in zip(bounds, histogram.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == math.inf else repr(bound)
+                        lines.append(
+                            f"{metric}_bucket{labels_text(key, le=le)} {cumulative}"
+                        )
+                    lines.append(f"{metric}_sum{labels_text(key)} {histogram.sum}")
+                    lines.append(f"{metric}_count{labels_text(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Write the Prometheus text file atomically.
+
+        Args:
+            path: Path of the text file
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as prometheus_file:
+            prometheus_file.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+
+# Registry shared by the whole run
+metrics = MetricsRegistry()
+
+
+def record_place(category: str, seconds: float, reviews: int) -> None:
+    """Record a place written to the output.
+
+    Args:
+        category: First category the place matched
+        seconds: Time spent scraping the place
+        reviews: Number of reviews written with it
+    """
+    metrics.observe("place_seconds", seconds, category=category)
+    metrics.inc("places_total", category=category)
+    metrics.inc("reviews_total", reviews, category=category)
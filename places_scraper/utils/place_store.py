@@ -0,0 +1,203 @@
+"""Store of the last scraped state of each place, for recurring crawls."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from ..models.place import Place, Review
+
+REVIEW_SYNC_MODES = ("full", "incremental")
+
+
+def review_key(review: Review) -> str:
+    """Return the key identifying a review in the review index.
+
+    Args:
+        review: Scraped review
+
+    Returns:
+        Its review id, or its author, date and start of text without one
+    """
+    return review.review_id or f"{review.author}_{review.time}_{review.text[:50]}"
+
+
+class PlaceStore:
+    """SQLite-backed record of each place's rating, review count and reviews.
+
+    Places are keyed by their Places id, or their Maps URL in ``selenium``
+    mode. Refresh runs compare the rating and review count a search returns
+    with the stored ones; a place whose rating and count did not move keeps
+    its stored reviews instead of having them scraped again. Incremental
+    review sync scrapes reviews newest first until it reaches one already in
+    the place's review index.
+
+    Reviews are only ever appended, newest batch first. A place with reviews
+    on record but none scraped is not stored, as its review scraping most
+    likely failed, so it is retried on the next run.
+
+    The store is shared by the event loop and browser pool threads.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        """Open or create the store database.
+
+        Args:
+            path: Path of the SQLite database file
+            clock: Wall clock returning seconds, injectable for testing
+        """
+        self.path = path
+        self._clock = clock
+        self.unchanged = 0
+        self.changed = 0
+        self.new_reviews = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Worker processes share the database, so wait out each other's writes
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS places (
+                place_key TEXT PRIMARY KEY,
+                rating TEXT NOT NULL,
+                total_reviews INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reviews (
+                place_key TEXT NOT NULL,
+                review_key TEXT NOT NULL,
+                added_at REAL NOT NULL,
+                position INTEGER NOT NULL,
+                review TEXT NOT NULL,
+                PRIMARY KEY (place_key, review_key)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def reviews(self, key: str, limit: Optional[int] = None) -> List[Review]:
+        """Return the stored reviews of a place, newest first.
+
+        Args:
+            key: Places id or Maps URL identifying the place
+            limit: Maximum number of reviews to return
+
+        Returns:
+            Stored reviews, empty if there are none
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT review FROM reviews WHERE place_key = ?
+                ORDER BY added_at DESC, position LIMIT ?
+                """,
+                (key, -1 if limit is None else limit),
+            ).fetchall()
+        return [Review.from_dict(json.loads(row[0])) for row in rows]
+
+    def review_keys(self, key: str) -> Set[str]:
+        """Return the review index of a place: the keys of its stored reviews."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT review_key FROM reviews WHERE place_key = ?", (key,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def unchanged_reviews(
+        self, place: Place, key: Optional[str] = None, limit: Optional[int] = None
+    ) -> Optional[List[Review]]:
+        """Return the stored reviews of a place, if it did not change.
+
+        Args:
+            place: Place returned by a search
+            key: Key of the place, its Places id by default
+            limit: Maximum number of reviews to return
+
+        Returns:
+            The newest reviews stored for the place, or None if it is not
+            stored or its rating or review count moved
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rating, total_reviews FROM places WHERE place_key = ?",
+                (key or place.place_id,),
+            ).fetchone()
+            if row is None or row != (str(place.rating), place.total_reviews):
+                self.changed += 1
+                return None
+            self.unchanged += 1
+        return self.reviews(key or place.place_id, limit)
+
+    def put(self, place: Place, key: Optional[str] = None) -> None:
+        """Store a place, appending those of its reviews not stored yet.
+
+        Args:
+            place: Place with its scraped reviews, newest first
+            key: Key of the place, its Places id by default
+        """
+        if place.total_reviews and not place.reviews:
+            return
+        key = key or place.place_id
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO places VALUES (?, ?, ?, ?)",
+                (key, str(place.rating), place.total_reviews, now),
+            )
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO reviews VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        key,
+                        review_key(review),
+                        now,
+                        position,
+                        json.dumps(review.to_dict(), ensure_ascii=False),
+                    )
+                    for position, review in enumerate(place.reviews)
+                ),
+            )
+            self.new_reviews += self._conn.total_changes - before
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the counts of unchanged and changed places and new reviews."""
+        return {
+            "refresh_unchanged_places": self.unchanged,
+            "refresh_changed_places": self.changed,
+            "new_reviews_stored": self.new_reviews,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def place_store_from_config(config: Dict[str, Any]) -> Optional[PlaceStore]:
+    """Build the place store of a refresh or incremental review sync run.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        PlaceStore at ``placeStore`` (by default under ``output_dir``), or
+        None unless ``refresh`` or incremental ``reviewSync`` is enabled
+    """
+    if not config.get("refresh", False) and config.get("reviewSync", "full") == "full":
+        return None
+
+    output_dir = config.get("output_dir", "output")
+    return PlaceStore(
+        config.get("placeStore", os.path.join(output_dir, "places.sqlite3"))
+    )
@@ -0,0 +1,247 @@
+"""Opt-in cProfile and tracemalloc scopes around the stages of a run.
+
+Scrapers wrap their stages in ``profiler.stage(name)``, which does nothing
+unless profiling was started. Once started, each thread profiles each stage
+with its own cProfile profiler, so stages running in browser pool threads and
+in the output writer thread do not mix. Nested stages pause the enclosing one.
+Coroutines only wrap their synchronous parts: while a coroutine awaits, other
+tasks run on the same thread and would be profiled as part of its stage.
+
+At the end of a run, the profiles are dumped per stage, together with a
+summary of each stage's hotspots and of the largest allocation sites.
+
+From Python 3.12, only one cProfile profiler may be active in the whole
+interpreter at a time, so profilers cannot run per thread and stage. There,
+a single profiler covers the whole run instead, dumped as the ``run`` stage,
+and the stages only record their wall time and allocations.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Number of functions and allocation sites listed per section of the summary
+DEFAULT_TOP_N = 20
+
+# Frames kept per traced allocation
+TRACEMALLOC_FRAMES = 5
+
+# Whether profilers may run per thread and stage, which Python 3.12 forbids
+PER_STAGE_PROFILES = sys.version_info < (3, 12)
+
+logger = logging.getLogger(__name__)
+
+
+def profile_dir_for(output_path: str) -> str:
+    """Return the directory of the profile dumps belonging to an output file.
+
+    Args:
+        output_path: Path of the run's output file
+
+    Returns:
+        Path of the profile directory next to it
+    """
+    directory, filename = os.path.split(output_path)
+    return os.path.join(directory, f"{filename.split('.', 1)[0]}.profile")
+
+
+class StageProfiler:
+    """Collects per-stage profiles while enabled."""
+
+    def __init__(self):
+        """Initialize a disabled profiler."""
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiles: List[Tuple[str, cProfile.Profile]] = []
+        # Stage name -> [calls, seconds, net allocated bytes]
+        self._totals: Dict[str, List[float]] = {}
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._tracing = False
+        self._run_profile: Optional[cProfile.Profile] = None
+
+    def start(self, trace_memory: bool = True) -> None:
+        """Drop earlier results and start profiling stages.
+
+        Args:
+            trace_memory: Also trace allocations with tracemalloc, which slows
+                the run down further
+        """
+        with self._lock:
+            self._profiles = []
+            self._totals = {}
+            self._snapshot = None
+        self._local = threading.local()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._tracing = True
+        if not PER_STAGE_PROFILES:
+            logger.warning(
+                "Python %d.%d runs one profiler at a time: the whole run is "
+                "profiled as a single stage, other stages get totals only",
+                *sys.version_info[:2],
+            )
+            self._run_profile = cProfile.Profile()
+            with self._lock:
+                self._profiles.append(("run", self._run_profile))
+            self._run_profile.enable()
+        self.enabled = True
+
+    def stop(self) -> None:
+        """Stop profiling, keeping the results for ``write``."""
+        self.enabled = False
+        if self._run_profile is not None:
+            self._run_profile.disable()
+            self._run_profile = None
+        if self._tracing:
+            self._snapshot = tracemalloc.take_snapshot().filter_traces(
+                (
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                )
+            )
+            tracemalloc.stop()
+            self._tracing = False
+
+    def _profile(self, name: str) -> cProfile.Profile:
+        """Return this thread's profiler for a stage."""
+        profiles = getattr(self._local, "profiles", None)
+        if profiles is None:
+            profiles = self._local.profiles = {}
+            self._local.stack = []
+        if name not in profiles:
+            profiles[name] = cProfile.Profile()
+            with self._lock:
+                self._profiles.append((name, profiles[name]))
+        return profiles[name]
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile a block as part of a stage.
+
+        Args:
+            name: Stage name, e.g. ``get_reviews``
+        """
+        if not self.enabled:
+            yield
+            return
+        if self._run_profile is not None:
+            with self._measure(name):
+                yield
+            return
+
+        profile = self._profile(name)
+        stack = self._local.stack
+        if profile in stack:
+            # Re-entered the same stage; the outer scope already covers it
+            yield
+            return
+        if stack:
+            stack[-1].disable()
+        stack.append(profile)
+        try:
+            with self._measure(name):
+                profile.enable()
+                try:
+                    yield
+                finally:
+                    profile.disable()
+        finally:
+            stack.pop()
+            if stack:
+                stack[-1].enable()
+
+    @contextmanager
+    def _measure(self, name: str) -> Iterator[None]:
+        """Add a block's wall time and net allocations to a stage's totals."""
+        memory_start = tracemalloc.get_traced_memory()[0] if self._tracing else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            allocated = (
+                tracemalloc.get_traced_memory()[0] - memory_start if self._tracing else 0
+            )
+            with self._lock:
+                totals = self._totals.setdefault(name, [0, 0.0, 0])
+                totals[0] += 1
+                totals[1] += elapsed
+                totals[2] += allocated
+
+    def stage_stats(self) -> Dict[str, pstats.Stats]:
+        """Return the profiles of each stage, merged over threads."""
+        with self._lock:
+            profiles = list(self._profiles)
+        merged: Dict[str, pstats.Stats] = {}
+        for name, profile in profiles:
+            if not profile.getstats():
+                continue
+            if name in merged:
+                merged[name].add(profile)
+            else:
+                merged[name] = pstats.Stats(profile)
+        return merged
+
+    def summary(self, top_n: int = DEFAULT_TOP_N) -> str:
+        """Return the stage totals, hotspots and top allocation sites as text.
+
+        Args:
+            top_n: Number of functions and allocation sites to list
+        """
+        lines = ["Stage totals (wall time includes nested stages)"]
+        with self._lock:
+            totals = dict(self._totals)
+        for name, (calls, seconds, allocated) in sorted(
+            totals.items(), key=lambda item: -item[1][1]
+        ):
+            line = f"  {name:<16} {calls:>8.0f} calls {seconds:>10.2f} s"
+            if self._snapshot is not None:
+                line += f" {allocated / 1024:>12.0f} KiB net allocated"
+            lines.append(line)
+
+        for name, stats in sorted(self.stage_stats().items()):
+            stream = io.StringIO()
+            report = pstats.Stats(stream=stream).add(stats)
+            report.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top_n)
+            lines += ["", f"Hotspots of {name} by cumulative time", stream.getvalue()]
+
+        if self._snapshot is not None:
+            lines += ["", f"Top {top_n} allocation sites still held at the end of the run"]
+            for stat in self._snapshot.statistics("lineno")[:top_n]:
+                frame = stat.traceback[0]
+                lines.append(
+                    f"  {stat.size / 1024:>10.1f} KiB {stat.count:>8} blocks"
+                    f"  {frame.filename}:{frame.lineno}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: str, top_n: int = DEFAULT_TOP_N) -> None:
+        """Dump each stage's profile and the summary into a directory.
+
+        The ``<stage>.prof`` dumps can be loaded with ``pstats`` or viewers
+        such as snakeviz.
+
+        Args:
+            directory: Directory to write ``<stage>.prof`` and ``summary.txt`` to
+            top_n: Number of functions and allocation sites to list
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name, stats in self.stage_stats().items():
+            stats.dump_stats(os.path.join(directory, f"{name}.prof"))
+        with open(
+            os.path.join(directory, "summary.txt"), "w", encoding="utf-8"
+        ) as summary_file:
+            summary_file.write(self.summary(top_n))
+
+
+# Profiler shared by the whole run
+profiler = StageProfiler()
@@ -0,0 +1,115 @@
+"""Async rate limiting utilities."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# Default per-endpoint quotas, matching the Places API default of 600 QPM
+DEFAULT_RATE_LIMITS: Dict[str, Dict[str, float]] = {
+    "searchText": {"qps": 10, "burst": 10},
+    "getPlace": {"qps": 10, "burst": 10},
+}
+
+
+class TokenBucket:
+    """Async token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``. Waiters
+    are served in arrival order and sleep without blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        """Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens the bucket can hold
+            clock: Monotonic clock returning seconds, injectable for testing
+            sleep: Awaitable sleep function, injectable for testing
+        """
+        if rate <= 0:
+            raise ValueError("rate must be a positive number")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update."""
+        now = self._clock()
+        self._tokens = min(
+            float(self.burst), self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Number of tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Wait until ``tokens`` are available and take them.
+
+        Args:
+            tokens: Number of tokens to take
+        """
+        if tokens > self.burst:
+            raise ValueError("Cannot acquire more tokens than the bucket burst")
+
+        # The lock keeps waiters in FIFO order so no caller starves
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await self._sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+
+class RateLimiter:
+    """Per-endpoint collection of token buckets."""
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Dict[str, float]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        """Initialize the rate limiter.
+
+        Args:
+            limits: Mapping of endpoint name to ``{"qps": ..., "burst": ...}``,
+                merged over DEFAULT_RATE_LIMITS
+            clock: Monotonic clock returning seconds, injectable for testing
+            sleep: Awaitable sleep function, injectable for testing
+        """
+        merged = {**DEFAULT_RATE_LIMITS, **(limits or {})}
+        self.buckets = {
+            endpoint: TokenBucket(
+                limit["qps"], int(limit.get("burst", 1)), clock=clock, sleep=sleep
+            )
+            for endpoint, limit in merged.items()
+        }
+
+    async def acquire(self, endpoint: str, tokens: float = 1) -> None:
+        """Wait for quota on an endpoint.
+
+        Args:
+            endpoint: Endpoint name, e.g. "searchText" or "getPlace"
+            tokens: Number of tokens to take
+        """
+        bucket = self.buckets.get(endpoint)
+        if bucket is not None:
+            await bucket.acquire(tokens)
@@ -0,0 +1,100 @@
+"""Run-wide registry of places for cross-category deduplication."""
+
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Maps feature id embedded in place URLs, e.g. "!1s0x31752f...:0x4a1b..."
+FEATURE_ID_PATTERN = re.compile(r"!1s(0x[0-9a-f]+:0x[0-9a-f]+)")
+
+
+def canonical_maps_url(url: str) -> str:
+    """Reduce a Google Maps place URL to a stable identity.
+
+    Search result links carry session parameters and camera positions that
+    differ between searches, so the place's feature id is used when present;
+    otherwise only the ``q`` query parameter is kept.
+
+    Args:
+        url: Google Maps place URL
+
+    Returns:
+        Canonical URL identifying the place
+    """
+    match = FEATURE_ID_PATTERN.search(url)
+    if match:
+        return f"https://www.google.com/maps/place/data=!4m2!3m1!1s{match.group(1)}"
+
+    parts = urlsplit(url)
+    query = [(name, value) for name, value in parse_qsl(parts.query) if name == "q"]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+class PlaceRegistry:
+    """Places found during a run, keyed by Places id or canonical Maps URL.
+
+    A place matched by several categories is kept once, with every matching
+    category, so its reviews are fetched once. The registry also tracks which
+    categories still have places waiting to be written.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._records: Dict[str, Any] = {}
+        self._categories: Dict[str, List[str]] = {}
+        self._pending: Dict[str, Set[str]] = {}
+        self._finished: List[str] = []
+        self.fetches_saved = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        """Iterate over (key, record) pairs in first-seen order."""
+        return iter(list(self._records.items()))
+
+    def register(self, category: str, places: Iterable[Tuple[str, Any]]) -> None:
+        """Add a category's search results.
+
+        Args:
+            category: Category the places were found under
+            places: (key, record) pairs in search order
+        """
+        pending = self._pending.setdefault(category, set())
+        for key, record in places:
+            if key in self._records:
+                # Already scheduled for review fetching under another match
+                self.fetches_saved += 1
+                if category not in self._categories[key]:
+                    self._categories[key].append(category)
+            else:
+                self._records[key] = record
+                self._categories[key] = [category]
+            pending.add(key)
+
+    def categories(self, key: str) -> List[str]:
+        """Return every category a place matched, in match order."""
+        return self._categories[key]
+
+    def mark_written(self, key: str) -> None:
+        """Record that a place was written or skipped.
+
+        Args:
+            key: Places id or canonical Maps URL of the place
+        """
+        for category in self._categories.get(key, []):
+            self._pending[category].discard(key)
+
+    def drain_finished(self) -> List[str]:
+        """Return newly finished categories, in registration order.
+
+        Returns:
+            Categories whose places have all been written since the last call
+        """
+        finished = [
+            category
+            for category, pending in self._pending.items()
+            if not pending and category not in self._finished
+        ]
+        self._finished.extend(finished)
+        return finished
@@ -0,0 +1,433 @@
+"""Streaming output sinks for scraped places."""
+
+import gzip
+import json
+import os
+import queue
+import threading
+import zlib
+from typing import IO, Any, Dict, Iterator, List, Optional, Union, cast
+
+from ..models.place import Place
+from .checkpoint import RunManifest
+from .metrics import metrics
+from .profiling import profiler
+
+try:
+    import orjson
+except ImportError:  # optional, only speeds up encoding
+    orjson = None  # type: ignore[assignment]
+
+DEFAULT_OUTPUT_FORMAT = "json"
+
+DEFAULT_OUTPUT_BUFFER = 256
+
+# A place, or any JSON-serializable place data
+Record = Union[Place, Dict[str, Any]]
+
+
+class SinkCancelled(RuntimeError):
+    """Raised by a sink whose run was cancelled, e.g. after losing its job lease."""
+
+
+def encode_json(record: Dict[str, Any], indent: Optional[int] = None) -> bytes:
+    """Encode a record as UTF-8 JSON.
+
+    Compact output is encoded with orjson when it is installed.
+
+    Args:
+        record: JSON-serializable data; other values are encoded as strings
+        indent: Spaces per indentation level, or None/0 for compact output
+
+    Returns:
+        Encoded record
+    """
+    if indent:
+        return json.dumps(record, ensure_ascii=False, indent=indent, default=str).encode(
+            "utf-8"
+        )
+    if orjson is not None:
+        return orjson.dumps(record, default=str)
+    return json.dumps(
+        record, ensure_ascii=False, separators=(",", ":"), default=str
+    ).encode("utf-8")
+
+
+def iter_json(record: Record, indent: Optional[int] = None) -> Iterator[bytes]:
+    """Encode a record as UTF-8 JSON chunks.
+
+    Compact places are streamed a review at a time after their other fields,
+    so no intermediate list of review dictionaries is built.
+
+    Args:
+        record: Place or JSON-serializable data
+        indent: Spaces per indentation level, or None/0 for compact output
+
+    Yields:
+        Consecutive pieces of the encoded record
+    """
+    if not isinstance(record, Place):
+        yield encode_json(record, indent)
+        return
+    if indent:
+        yield encode_json(record.to_dict(), indent)
+        return
+
+    # Reopen the encoded object to append the reviews array
+    yield encode_json(record.to_dict(include_reviews=False))[:-1] + b',"reviews":['
+    for index, review in enumerate(record.reviews):
+        if index:
+            yield b","
+        yield encode_json(review.to_dict())
+    yield b"]}"
+
+
+class OutputSink:
+    """Writes place records to a file one at a time.
+
+    Subclasses define the framing. ``close`` always leaves a well-formed file,
+    and ``tell`` after ``flush`` is the offset a resumed run truncates back to.
+    """
+
+    extension = ""
+
+    def __init__(
+        self,
+        path: str,
+        record_count: int = 0,
+        resume_offset: Optional[int] = None,
+        indent: Optional[int] = None,
+    ):
+        """Open the output file.
+
+        Args:
+            path: Path of the output file
+            record_count: Number of records already in the file when resuming
+            resume_offset: Offset of the last complete record to resume after,
+                or None to start a new file
+            indent: Spaces per indentation level in formats that allow it,
+                or None for compact records
+        """
+        self.path = path
+        self.record_count = record_count
+        self.indent = indent
+        self._file: IO[bytes]
+        if resume_offset is None:
+            self._file = open(path, "wb")
+            self._file.write(self._header())
+        else:
+            os.truncate(path, resume_offset)
+            self._file = open(path, "ab")
+        self._closed = False
+
+    def _header(self) -> bytes:
+        return b""
+
+    def _footer(self) -> bytes:
+        return b""
+
+    def _encode(self, record: Record) -> Iterator[bytes]:
+        raise NotImplementedError
+
+    def write(self, record: Record) -> None:
+        """Write one place record.
+
+        Args:
+            record: Place or JSON-serializable place data
+        """
+        for chunk in self._encode(record):
+            self._file.write(chunk)
+        self.record_count += 1
+
+    def flush(self) -> None:
+        """Push buffered records to disk."""
+        self._file.flush()
+
+    def tell(self) -> int:
+        """Return the current offset in the output file."""
+        return self._file.tell()
+
+    def close(self) -> None:
+        """Terminate and close the output file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._file.write(self._footer())
+        self._file.close()
+
+    def abandon(self) -> None:
+        """Close the output file as it is, without terminating it."""
+        if self._closed:
+            return
+        self._closed = True
+        self._file.close()
+
+
+class JsonArraySink(OutputSink):
+    """Writes places as elements of a single JSON array."""
+
+    extension = ".json"
+
+    def _header(self) -> bytes:
+        return b"[\n"
+
+    def _footer(self) -> bytes:
+        return b"\n]"
+
+    def _encode(self, record: Record) -> Iterator[bytes]:
+        if self.record_count:
+            yield b",\n"
+        yield from iter_json(record, self.indent)
+
+
+class NdjsonSink(OutputSink):
+    """Writes one compact JSON document per line."""
+
+    extension = ".ndjson"
+
+    def _encode(self, record: Record) -> Iterator[bytes]:
+        yield from iter_json(record)
+        yield b"\n"
+
+
+class GzipNdjsonSink(NdjsonSink):
+    """Writes gzip-compressed NDJSON.
+
+    Every flush is a zlib sync flush, so the compressed prefix up to a
+    checkpointed offset always decompresses to whole lines.
+    """
+
+    extension = ".ndjson.gz"
+
+    def __init__(
+        self,
+        path: str,
+        record_count: int = 0,
+        resume_offset: Optional[int] = None,
+        indent: Optional[int] = None,
+    ):
+        self.path = path
+        self.record_count = record_count
+        self.indent = indent
+
+        recovered = b""
+        if resume_offset is not None:
+            # A truncated gzip member cannot be appended to, so recompress the
+            # valid prefix into a fresh stream
+            with open(path, "rb") as raw_file:
+                compressed = raw_file.read(resume_offset)
+            recovered = zlib.decompressobj(zlib.MAX_WBITS | 16).decompress(compressed)
+
+        self._raw = open(path, "wb")
+        self._gzip = gzip.GzipFile(fileobj=self._raw, mode="wb")
+        self._file = cast(IO[bytes], self._gzip)
+        self._file.write(recovered)
+        self._closed = False
+
+    def flush(self) -> None:
+        self._file.flush()
+        self._raw.flush()
+
+    def tell(self) -> int:
+        return self._raw.tell()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._file.close()
+        self._raw.close()
+
+    def abandon(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        # Detach the gzip stream so closing it writes no trailer
+        self._gzip.fileobj = None  # type: ignore[assignment]
+        self._gzip.close()
+        self._raw.close()
+
+
+SINK_FORMATS = {
+    "json": JsonArraySink,
+    "ndjson": NdjsonSink,
+    "ndjson.gz": GzipNdjsonSink,
+}
+
+
+class BackgroundSink:
+    """Feeds a sink from a bounded queue on a background writer thread.
+
+    Producers block once ``max_pending`` records are queued, which bounds
+    memory. The writer drains whatever is queued, flushes once, and then
+    checkpoints the written places and finished categories in the manifest.
+
+    Once the optional ``cancel`` event is set, nothing more is written: the
+    writer drops what is queued, producers get SinkCancelled, and closing
+    leaves the output file and manifest as they are.
+    """
+
+    def __init__(
+        self,
+        sink: OutputSink,
+        manifest: Optional[RunManifest] = None,
+        max_pending: int = DEFAULT_OUTPUT_BUFFER,
+        cancel: Optional[threading.Event] = None,
+    ):
+        """Start the writer thread.
+
+        Args:
+            sink: Sink to write to
+            manifest: Optional checkpoint manifest to update after each flush
+            max_pending: Maximum number of queued records
+            cancel: Optional event stopping all further writes once set
+        """
+        self.sink = sink
+        self.manifest = manifest
+        self.cancel = cancel
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+        sink.flush()
+        if manifest is not None:
+            manifest.record([], [], sink.tell())
+
+        self._thread = threading.Thread(
+            target=self._run, name="output-writer", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> "BackgroundSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _cancelled(self) -> bool:
+        if self.cancel is None or not self.cancel.is_set():
+            return False
+        if self._error is None:
+            self._error = SinkCancelled(f"Writing to {self.sink.path} was cancelled")
+        return True
+
+    def _check(self) -> None:
+        self._cancelled()
+        if self._error is not None:
+            raise self._error
+        if self._closed:
+            raise RuntimeError("Output sink is closed")
+
+    def write(self, record: Record, key: str) -> None:
+        """Queue a place record.
+
+        Args:
+            record: Place or JSON-serializable place data; it is encoded on
+                the writer thread and must not change after being queued
+            key: Places id or Maps URL identifying the place in the manifest
+        """
+        self._check()
+        self._queue.put(("place", record, key))
+
+    def end_category(self, category: str) -> None:
+        """Queue the end of a category, recorded after its places are written.
+
+        Args:
+            category: Category whose places have all been queued
+        """
+        self._check()
+        self._queue.put(("category", category, None))
+
+    def _run(self) -> None:
+        done = False
+        while not done:
+            ops = [self._queue.get()]
+            while True:
+                try:
+                    ops.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            metrics.set("output_queue_depth", len(ops))
+
+            if self._cancelled() or self._error is not None:
+                done = any(op is None for op in ops)
+                continue
+
+            keys: List[str] = []
+            categories: List[str] = []
+            try:
+                with metrics.timer("write_seconds"), profiler.stage("write"):
+                    for op in ops:
+                        if op is None:
+                            done = True
+                        elif op[0] == "place":
+                            self.sink.write(op[1])
+                            keys.append(op[2])
+                        else:
+                            categories.append(op[1])
+                    self.sink.flush()
+                metrics.inc("records_written_total", len(keys))
+                if self.manifest is not None and (keys or categories):
+                    self.manifest.record(keys, categories, self.sink.tell())
+            except BaseException as error:  # pylint: disable=broad-except
+                self._error = error
+
+    def close(self) -> None:
+        """Write out everything queued and terminate the output file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        if self._cancelled():
+            self.sink.abandon()
+        else:
+            self.sink.close()
+        if self._error is not None:
+            raise self._error
+
+
+def open_sink(
+    path: str,
+    output_format: str = DEFAULT_OUTPUT_FORMAT,
+    manifest: Optional[RunManifest] = None,
+    resume: bool = False,
+    max_pending: int = DEFAULT_OUTPUT_BUFFER,
+    indent: Optional[int] = None,
+    cancel: Optional[threading.Event] = None,
+) -> BackgroundSink:
+    """Open a buffered sink for a run.
+
+    Args:
+        path: Path of the output file
+        output_format: One of SINK_FORMATS
+        manifest: Checkpoint manifest of the run
+        resume: Continue after the last checkpointed record of ``manifest``,
+            which is then required
+        max_pending: Maximum number of queued records
+        indent: Spaces per indentation level of ``json`` output, or None for
+            one compact record per line
+        cancel: Optional event stopping all further writes once set
+
+    Returns:
+        BackgroundSink writing to the output file
+
+    Raises:
+        ValueError: If the format is unknown, or ``resume`` is set without a
+            manifest
+    """
+    if output_format not in SINK_FORMATS:
+        raise ValueError(
+            f"Invalid output format. Must be {', '.join(SINK_FORMATS.keys())}"
+        )
+
+    sink_class = SINK_FORMATS[output_format]
+    if resume:
+        if manifest is None:
+            raise ValueError("Resuming output needs the run's checkpoint manifest")
+        sink = sink_class(
+            path, manifest.place_count, manifest.data["output_offset"], indent
+        )
+    else:
+        sink = sink_class(path, indent=indent)
+    return BackgroundSink(sink, manifest, max_pending, cancel)
@@ -0,0 +1,81 @@
+"""Tests for PageWaiter against the local Maps fixture pages."""
+
+import pytest
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+from benchmarks.maps_server import MapsFixtureServer
+from places_scraper.scrapers.page_waiter import PageWaiter
+
+REVIEW_SELECTOR = "div.jftiEf"
+
+
+@pytest.fixture(scope="module")
+def driver():
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    try:
+        chrome = webdriver.Chrome(options=options)
+    except WebDriverException as error:
+        pytest.skip(f"Chrome is not available: {error.msg}")
+    yield chrome
+    chrome.quit()
+
+
+@pytest.fixture(scope="module")
+def server():
+    with MapsFixtureServer(reviews_per_place=20, review_delay_ms=200) as fixtures:
+        yield fixtures
+
+
+def open_reviews(driver, server) -> int:
+    """Open a fixture place page on its reviews tab and count the reviews."""
+    driver.get(f"{server.url}/place/?q=Fixture+Cafe")
+    driver.find_element(By.CSS_SELECTOR, "button[aria-label*='Reviews for']").click()
+    # Keep the first batch taller than the pane, so that it can scroll
+    driver.execute_script("document.querySelector('div.m6QErb').style.height = '100px'")
+    return len(driver.find_elements(By.CSS_SELECTOR, REVIEW_SELECTOR))
+
+
+def test_waits_for_the_next_batch_after_scrolling(driver, server):
+    waiter = PageWaiter(driver)
+    baseline = open_reviews(driver, server)
+
+    count = waiter.wait_for_nodes(REVIEW_SELECTOR, baseline, scroll=True)
+
+    assert count == baseline + 10
+    # The batch arrives after the fixture's 200 ms delay, well before the timeout
+    assert 0.15 < waiter.average_latency < 2
+
+
+def test_returns_the_baseline_once_nothing_loads(driver, server):
+    waiter = PageWaiter(driver, initial_timeout=0.5)
+    count = open_reviews(driver, server)
+    while True:
+        new_count = waiter.wait_for_nodes(REVIEW_SELECTOR, count, scroll=True)
+        if new_count <= count:
+            break
+        count = new_count
+
+    assert count == 20
+    assert waiter.wait_for_nodes(REVIEW_SELECTOR, count, scroll=True) == count
+
+
+def test_timeout_follows_latency_within_bounds():
+    class StubDriver:
+        def __init__(self):
+            self.script_timeout = None
+
+        def set_script_timeout(self, seconds):
+            self.script_timeout = seconds
+
+    waiter = PageWaiter(StubDriver(), min_timeout=1.0, max_timeout=10.0, factor=4.0)
+    assert waiter.timeout == 5.0
+
+    waiter.average_latency = 0.1
+    assert waiter.timeout == 1.0
+    waiter.average_latency = 0.5
+    assert waiter.timeout == 2.0
+    waiter.average_latency = 5.0
+    assert waiter.timeout == 10.0
@@ -0,0 +1,101 @@
+"""Tests for the token bucket and per-endpoint rate limiter."""
+
+import asyncio
+
+import pytest
+
+from places_scraper.utils.rate_limiter import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Clock that only moves when slept on, recording every sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_bucket_serves_burst_without_waiting():
+    clock = FakeClock()
+    bucket = TokenBucket(2, burst=3, clock=clock, sleep=clock.sleep)
+
+    async def take(count):
+        for _ in range(count):
+            await bucket.acquire()
+
+    asyncio.run(take(3))
+    assert clock.sleeps == []
+    assert bucket.tokens == 0
+
+
+def test_bucket_waits_for_refill_once_empty():
+    clock = FakeClock()
+    bucket = TokenBucket(2, burst=3, clock=clock, sleep=clock.sleep)
+
+    async def take(count):
+        for _ in range(count):
+            await bucket.acquire()
+
+    asyncio.run(take(5))
+    assert clock.sleeps == [pytest.approx(0.5), pytest.approx(0.5)]
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_bucket_refills_at_rate_up_to_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(4, burst=3, clock=clock, sleep=clock.sleep)
+    asyncio.run(bucket.acquire(3))
+
+    clock.now += 0.5
+    assert bucket.tokens == pytest.approx(2)
+    clock.now += 10
+    assert bucket.tokens == 3
+
+
+def test_bucket_rejects_more_than_burst():
+    bucket = TokenBucket(1, burst=2)
+    with pytest.raises(ValueError):
+        asyncio.run(bucket.acquire(3))
+
+
+def test_limiter_limits_each_endpoint_separately():
+    clock = FakeClock()
+    limiter = RateLimiter(
+        {"searchText": {"qps": 1, "burst": 1}}, clock=clock, sleep=clock.sleep
+    )
+
+    async def calls():
+        await limiter.acquire("searchText")
+        for _ in range(10):
+            await limiter.acquire("getPlace")
+        assert clock.sleeps == []
+        await limiter.acquire("searchText")
+
+    asyncio.run(calls())
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+def test_limiter_merges_limits_over_defaults():
+    limiter = RateLimiter({"searchText": {"qps": 1}})
+    assert limiter.buckets["searchText"].rate == 1
+    assert limiter.buckets["searchText"].burst == 1
+    assert limiter.buckets["getPlace"].rate == 10
+
+
+def test_limiter_does_not_limit_unknown_endpoints():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+
+    async def calls():
+        for _ in range(100):
+            await limiter.acquire("autocomplete")
+
+    asyncio.run(calls())
+    assert clock.sleeps == []